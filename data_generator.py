@@ -1,27 +1,187 @@
 import os
-from src.utils import RandomGenerator, Config
+from collections.abc import Iterator
+from multiprocessing import Pool
+from random import Random
+from src.columnar import ColumnarDataset, ColumnarWriter
+from src.inputs import open_data
+from src.line_index import LineIndex
+from src.utils import RandomGenerator, Config, DatasetFormat, GenerationMode
 
 ENTITY_TYPE = "user"
 ID_TYPE = "id"
 ATTRIBUTE_TYPE = "invite-code"
 RELATION_TYPE = "friendship"
+ATTRIBUTE_LENGTH = 8
 
-config = Config()
-random = RandomGenerator(config.random_seed)
-os.makedirs(f"{os.getcwd()}/{config.dataset_dir}", exist_ok=True)
+RELATION_TEMPLATE = (
+    f"""match $e1 isa {ENTITY_TYPE}; $e1 has {ID_TYPE} {{0}};"""
+    f""" $e2 isa {ENTITY_TYPE}; $e2 has {ID_TYPE} {{1}};"""
+    f""" insert ($e1, $e2) isa {RELATION_TYPE};"""
+)
 
-with open(f"{os.getcwd()}/{config.dataset_dir}/entities.tql", "w") as output:
-    for entity_id in range(1, config.entity_count + 1):
-        query = f"""insert $e isa {ENTITY_TYPE}; $e has {ID_TYPE} {entity_id};"""
+RELATION_FORMATS = ["q", "q"]
 
-        for _ in range(config.attributes_per_entity):
-            query += f""" $e has {ATTRIBUTE_TYPE} "{random.str(8)}";"""
 
-        output.write(query + "\n")
+def entity_template(attributes_per_entity: int) -> str:
+    template = f"""insert $e isa {ENTITY_TYPE}; $e has {ID_TYPE} {{0}};"""
+    template += "".join(f""" $e has {ATTRIBUTE_TYPE} "{{{column}}}";""" for column in range(1, attributes_per_entity + 1))
+    return template
 
-with open(f"{os.getcwd()}/{config.dataset_dir}/relations.tql", "w") as output:
-    for _ in range(config.relation_count):
-        query = f"""match $e1 isa {ENTITY_TYPE}; $e1 has {ID_TYPE} {random.int(config.entity_count)};"""
-        query += f""" $e2 isa {ENTITY_TYPE}; $e2 has {ID_TYPE} {random.int(config.entity_count)};"""
-        query += f""" insert ($e1, $e2) isa {RELATION_TYPE};"""
-        output.write(query + "\n")
+
+def entity_formats(attributes_per_entity: int) -> list[str]:
+    return ["q"] + [f"{ATTRIBUTE_LENGTH}s"] * attributes_per_entity
+
+
+def _encode(dataset_format: DatasetFormat, template: str, formats: list[str], rows: list[tuple]) -> str | list[bytes]:
+    match dataset_format:
+        case DatasetFormat.TQL:
+            return "".join(template.format(*row) + "\n" for row in rows)
+        case DatasetFormat.COLUMNAR:
+            return ColumnarDataset.encode(formats, rows)
+
+
+def _write(
+    dataset_format: DatasetFormat,
+    path: str,
+    template: str,
+    formats: list[str],
+    row_count: int,
+    chunks: Iterator[str | list[bytes]],
+) -> None:
+    match dataset_format:
+        case DatasetFormat.TQL:
+            with open_data(path, "wt") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+
+            LineIndex.build(path)
+        case DatasetFormat.COLUMNAR:
+            with ColumnarWriter(path, template, formats, row_count) as output:
+                for chunk in chunks:
+                    output.write(chunk)
+
+
+def _serial_chunks(rows: Iterator[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    chunk: list[tuple] = list()
+
+    for row in rows:
+        chunk.append(row)
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = list()
+
+    if chunk:
+        yield chunk
+
+
+def generate_serial(config: Config, entities_path: str, relations_path: str) -> None:
+    random = RandomGenerator(config.random_seed)
+    dataset_format = config.dataset_format
+    template = entity_template(config.attributes_per_entity)
+    formats = entity_formats(config.attributes_per_entity)
+
+    entity_rows = (
+        (entity_id, *(random.str(ATTRIBUTE_LENGTH) for _ in range(config.attributes_per_entity)))
+        for entity_id in range(1, config.entity_count + 1)
+    )
+
+    chunks = (_encode(dataset_format, template, formats, rows) for rows in _serial_chunks(entity_rows, config.generation_chunk_size))
+    _write(dataset_format, entities_path, template, formats, config.entity_count, chunks)
+
+    relation_rows = (
+        (random.int(config.entity_count), random.int(config.entity_count))
+        for _ in range(config.relation_count)
+    )
+
+    chunks = (
+        _encode(dataset_format, RELATION_TEMPLATE, RELATION_FORMATS, rows)
+        for rows in _serial_chunks(relation_rows, config.generation_chunk_size)
+    )
+
+    _write(dataset_format, relations_path, RELATION_TEMPLATE, RELATION_FORMATS, config.relation_count, chunks)
+
+
+def _chunk_random(random_seed: int, file: str, chunk_index: int) -> Random:
+    # Seeds depend only on the chunk, never on the worker rendering it, so output is identical for any worker count.
+    return Random(f"{random_seed}:{file}:{chunk_index}")
+
+
+def _entity_chunk(
+    dataset_format: DatasetFormat,
+    random_seed: int,
+    chunk_index: int,
+    first_id: int,
+    count: int,
+    attributes_per_entity: int,
+) -> str | list[bytes]:
+    random = _chunk_random(random_seed, "entities", chunk_index)
+    attribute_count = count * attributes_per_entity
+    text = "".join(random.choices(RandomGenerator.char_set, k=attribute_count * ATTRIBUTE_LENGTH))
+    codes = [text[start:start + ATTRIBUTE_LENGTH] for start in range(0, len(text), ATTRIBUTE_LENGTH)]
+
+    rows = [
+        (first_id + offset, *codes[offset * attributes_per_entity:(offset + 1) * attributes_per_entity])
+        for offset in range(count)
+    ]
+
+    return _encode(dataset_format, entity_template(attributes_per_entity), entity_formats(attributes_per_entity), rows)
+
+
+def _relation_chunk(
+    dataset_format: DatasetFormat,
+    random_seed: int,
+    chunk_index: int,
+    count: int,
+    entity_count: int,
+) -> str | list[bytes]:
+    random = _chunk_random(random_seed, "relations", chunk_index)
+    endpoints = random.choices(range(1, entity_count + 1), k=2 * count)
+    rows = list(zip(endpoints[0::2], endpoints[1::2]))
+    return _encode(dataset_format, RELATION_TEMPLATE, RELATION_FORMATS, rows)
+
+
+def _render_chunk(task: tuple) -> str | list[bytes]:
+    match task[0]:
+        case "entities":
+            return _entity_chunk(*task[1:])
+        case "relations":
+            return _relation_chunk(*task[1:])
+
+
+def generate_parallel(config: Config, entities_path: str, relations_path: str) -> None:
+    chunk_size = config.generation_chunk_size
+    worker_count = config.generation_workers or os.cpu_count()
+    dataset_format = config.dataset_format
+
+    entity_tasks = [
+        ("entities", dataset_format, config.random_seed, chunk_index, first_id, min(chunk_size, config.entity_count + 1 - first_id), config.attributes_per_entity)
+        for chunk_index, first_id in enumerate(range(1, config.entity_count + 1, chunk_size))
+    ]
+
+    relation_tasks = [
+        ("relations", dataset_format, config.random_seed, chunk_index, min(chunk_size, config.relation_count - start), config.entity_count)
+        for chunk_index, start in enumerate(range(0, config.relation_count, chunk_size))
+    ]
+
+    outputs = [
+        (entities_path, entity_template(config.attributes_per_entity), entity_formats(config.attributes_per_entity), config.entity_count, entity_tasks),
+        (relations_path, RELATION_TEMPLATE, RELATION_FORMATS, config.relation_count, relation_tasks),
+    ]
+
+    with Pool(worker_count) as pool:
+        for path, template, formats, row_count, tasks in outputs:
+            _write(dataset_format, path, template, formats, row_count, pool.imap(_render_chunk, tasks))
+
+
+if __name__ == "__main__":
+    config = Config()
+    os.makedirs(f"{os.getcwd()}/{config.dataset_dir}", exist_ok=True)
+    entities_path = f"{os.getcwd()}/{config.dataset_dir}/entities{config.data_suffix}"
+    relations_path = f"{os.getcwd()}/{config.dataset_dir}/relations{config.data_suffix}"
+
+    match config.generation_mode:
+        case GenerationMode.SERIAL:
+            generate_serial(config, entities_path, relations_path)
+        case GenerationMode.PARALLEL:
+            generate_parallel(config, entities_path, relations_path)
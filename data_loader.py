@@ -1,7 +1,11 @@
 import datetime
 import os
 from src.bulk_load_tests import BulkLoadTestBatch
-from src.utils import Logger, Config
+from src.metrics import LoadMetrics
+from src.profiler import ResourceProfiler
+from src.stats import describe
+from src.steady_state import SteadyStateMonitor
+from src.utils import AddressPolicy, Logger, Config
 
 if __name__ == "__main__":
     for config_path in ("config.ini",):
@@ -9,24 +13,106 @@ if __name__ == "__main__":
         timestamp = datetime.datetime.now().strftime("%y-%m-%d_%H-%M-%S")
         log_path = f"{os.getcwd()}/{config.logs_dir}/{timestamp}.txt"
         output_path = f"{os.getcwd()}/{config.results_dir}/{timestamp}.csv"
+        timeline_path = f"{os.getcwd()}/{config.results_dir}/{timestamp}_timeline.csv"
+        skipped_path = f"{os.getcwd()}/{config.results_dir}/{timestamp}_skipped.csv"
+        summary_path = f"{os.getcwd()}/{config.results_dir}/{timestamp}_summary.csv"
         os.makedirs(f"{os.getcwd()}/{config.logs_dir}", exist_ok=True)
         os.makedirs(f"{os.getcwd()}/{config.results_dir}", exist_ok=True)
         logger = Logger(log_path)
-        header = "loader_type,batch_size,transaction_count"
+        header = "loader_type,batch_size,transaction_count,coalescing_factor,trial,query_budget,rung,partial,process_count,thread_count"
 
         for file in config.data_files:
-            header += f",{file}_count,{file}_time"
+            header += f",{file}_count,{file}_time,{file}_setup_time"
 
-        with open(output_path, "w") as output:
+        for file in config.data_files:
+            header += "".join(f",{column}" for column in LoadMetrics.columns(file))
+
+        for file in config.data_files:
+            header += f",{file}_completion_time,{file}_dead_letters"
+            header += "".join(f",{column}" for column in SteadyStateMonitor.columns(file))
+
+        profile_columns = list()
+
+        if config.profile:
+            for file in config.data_files:
+                profile_columns += ResourceProfiler.columns(file)
+
+        header += "".join(f",{column}" for column in profile_columns)
+
+        address_columns = list()
+
+        if config.address_policy is not AddressPolicy.NONE:
+            for file in config.data_files:
+                for address in config.addresses:
+                    address_columns += LoadMetrics.address_columns(file, address)
+
+        header += "".join(f",{column}" for column in address_columns)
+
+        with open(output_path, "w") as output, open(timeline_path, "w") as timeline:
             output.write(f"{header}\n")
+            timeline.write("loader_type,batch_size,transaction_count,coalescing_factor,trial,file,second,committed_count\n")
             test_batch = BulkLoadTestBatch(config, logger)
+            rates: dict[str, dict[str, list[float]]] = dict()
 
             for result in test_batch.run():
-                entry = f"""{result["loader_type"]},{result["batch_size"]},{result["transaction_count"]}"""
+                # Budgeted runs of a configuration, e.g. the early rungs of successive halving, are summarised apart
+                # from its full runs.
+                config_key = f"""{result["loader_type"]},{result["batch_size"]},{result["transaction_count"]},{result["coalescing_factor"]}"""
+                test_key = f"""{config_key},{result["trial"]}"""
+                entry = f"""{test_key},{result["query_budget"]},{result["rung"]},{result["partial"]}"""
+                entry += f""",{result["process_count"]},{result["thread_count"]}"""
+                config_key += f""",{result["query_budget"]}"""
+                config_rates = rates.setdefault(config_key, dict())
+                config_rates.setdefault("total", list()).append(BulkLoadTestBatch.throughput(result, config.data_files))
+
+                for file in config.data_files:
+                    config_rates.setdefault(file, list()).append(BulkLoadTestBatch.throughput(result, [file]))
 
                 for file in config.data_files:
                     count_key = f"{file}_count"
                     time_key = f"{file}_time"
-                    entry += f",{result[count_key]},{result[time_key]}"
+                    setup_time_key = f"{file}_setup_time"
+                    entry += f",{result[count_key]},{result[time_key]},{result[setup_time_key]}"
+
+                for file in config.data_files:
+                    entry += "".join(f",{result[column]}" for column in LoadMetrics.columns(file))
+
+                for file in config.data_files:
+                    entry += f""",{result[f"{file}_completion_time"]},{result[f"{file}_dead_letters"]}"""
+                    entry += "".join(f",{result[column]}" for column in SteadyStateMonitor.columns(file))
+
+                entry += "".join(f",{result.get(column, 0)}" for column in profile_columns)
+                entry += "".join(f",{result[column]}" for column in address_columns)
 
                 output.write(f"{entry}\n")
+
+                for file in config.data_files:
+                    for second, committed_count in enumerate(result[f"{file}_timeline"]):
+                        timeline.write(f"{test_key},{file},{second},{committed_count}\n")
+
+        with open(skipped_path, "w") as skipped:
+            skipped.write("loader_type,batch_size,transaction_count,coalescing_factor,trial,rung,reason,dead_letters\n")
+
+            for point in test_batch.skipped:
+                trial = "" if point["trial"] is None else point["trial"]
+                skipped.write(
+                    f"""{point["loader_type"]},{point["batch_size"]},{point["transaction_count"]},"""
+                    f"""{point["coalescing_factor"]},{trial},{point["rung"]},"{point["reason"]}",{point["dead_letters"]}\n"""
+                )
+
+        # Rates are summarised per configuration over its trials, for the whole load and for each file.
+        with open(summary_path, "w") as summary:
+            summary_header = "loader_type,batch_size,transaction_count,coalescing_factor,query_budget,trials"
+
+            for name in ["total"] + config.data_files:
+                summary_header += f",{name}_rate_mean,{name}_rate_stdev,{name}_rate_ci"
+
+            summary.write(f"{summary_header}\n")
+
+            for config_key, config_rates in rates.items():
+                entry = f"""{config_key},{len(config_rates["total"])}"""
+
+                for name in ["total"] + config.data_files:
+                    entry += "".join(f",{value}" for value in describe(config_rates[name]))
+
+                summary.write(f"{entry}\n")
@@ -1,59 +1,106 @@
 package org.example;
 
-import com.vaticle.typedb.common.collection.Either;
-import com.vaticle.typedb.common.concurrent.NamedThreadFactory;
 import com.vaticle.typedb.driver.TypeDB;
 import com.vaticle.typedb.driver.api.TypeDBCredential;
 import com.vaticle.typedb.driver.api.TypeDBDriver;
 import com.vaticle.typedb.driver.api.TypeDBSession;
 import com.vaticle.typedb.driver.api.TypeDBTransaction;
 
-import javax.lang.model.type.NullType;
-import java.io.Console;
-import java.io.FileNotFoundException;
+import java.io.BufferedReader;
 import java.io.IOException;
+import java.io.InputStreamReader;
 import java.nio.file.Files;
-import java.nio.file.Path;
 import java.nio.file.Paths;
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.HashMap;
+import java.util.HashSet;
 import java.util.List;
-import java.util.Set;
-import java.util.concurrent.CompletableFuture;
-import java.util.concurrent.ExecutorService;
-import java.util.concurrent.Executors;
-import java.util.concurrent.LinkedBlockingQueue;
-import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.Map;
+
+import static java.nio.charset.StandardCharsets.UTF_8;
 
 public class Main {
-    public static void main(String[] args) throws IOException, InterruptedException {
-        ArrayList<String> filepaths = new ArrayList<>(List.of("../dataset/entities.tql", "../dataset/relations.tql"));
-        int batchSize = 2;
-        int transactionCount = 5;
-        Set<String> addresses = Set.of("localhost:1729");
-        String username = "admin";
-        String password = "password";
-        String database = "bulk-load-test";
-        TypeDBCredential credential = new TypeDBCredential(username, password, true);
-        String schema = Files.readString(Paths.get("../dataset/schema.tql"));
-
-        try (TypeDBDriver driver = TypeDB.cloudDriver(addresses, credential)) {
-            if (driver.databases().contains(database)) driver.databases().get(database).delete();
-            driver.databases().create(database);
-
-            try (TypeDBSession session = driver.session(database, TypeDBSession.Type.SCHEMA)) {
-                try (TypeDBTransaction transaction = session.transaction(TypeDBTransaction.Type.WRITE)) {
-                    transaction.query().define(schema);
-                    transaction.commit();
-                }
+    // Arguments match those passed by the Python test harness, which creates the database and schema itself, waits for
+    // "ready" once connected, and sends "start" when it begins timing. Without --harness the load starts immediately,
+    // and --schema recreates the database first, so the loader can still be run on its own.
+    private static Map<String, String> parseArguments(String[] args) {
+        Map<String, String> arguments = new HashMap<>(Map.of(
+            "driver", "core",
+            "addresses", "localhost:1729",
+            "username", "admin",
+            "database", "bulk-load-test",
+            "files", "../dataset/entities.tql,../dataset/relations.tql",
+            "batch-size", "100",
+            "transaction-count", "8"
+        ));
+
+        for (int i = 0; i < args.length; i++) {
+            if (!args[i].startsWith("--")) throw new IllegalArgumentException("Unexpected argument: " + args[i]);
+            String key = args[i].substring(2);
+
+            if (key.equals("harness")) arguments.put(key, "true");
+            else if (i + 1 < args.length) arguments.put(key, args[++i]);
+            else throw new IllegalArgumentException("Missing value for argument: " + args[i]);
+        }
+
+        return arguments;
+    }
+
+    private static TypeDBDriver driver(Map<String, String> arguments) {
+        List<String> addresses = Arrays.asList(arguments.get("addresses").split(","));
+
+        switch (arguments.get("driver")) {
+            case "core":
+                return TypeDB.coreDriver(addresses.get(0));
+            case "cloud":
+                String password = System.getenv("TYPEDB_PASSWORD");
+                TypeDBCredential credential = new TypeDBCredential(arguments.get("username"), password, true);
+                return TypeDB.cloudDriver(new HashSet<>(addresses), credential);
+            default:
+                throw new IllegalArgumentException("Unsupported driver type: " + arguments.get("driver"));
+        }
+    }
+
+    private static void defineSchema(TypeDBDriver driver, String database, String schemaPath) throws IOException {
+        String schema = Files.readString(Paths.get(schemaPath));
+        if (driver.databases().contains(database)) driver.databases().get(database).delete();
+        driver.databases().create(database);
+
+        try (TypeDBSession session = driver.session(database, TypeDBSession.Type.SCHEMA)) {
+            try (TypeDBTransaction transaction = session.transaction(TypeDBTransaction.Type.WRITE)) {
+                transaction.query().define(schema);
+                transaction.commit();
             }
+        }
+    }
+
+    public static void main(String[] args) throws IOException, InterruptedException {
+        Map<String, String> arguments = parseArguments(args);
+        String database = arguments.get("database");
+        List<String> filepaths = Arrays.asList(arguments.get("files").split(","));
+        int batchSize = Integer.parseInt(arguments.get("batch-size"));
+        int transactionCount = Integer.parseInt(arguments.get("transaction-count"));
+
+        try (TypeDBDriver driver = driver(arguments)) {
+            if (arguments.containsKey("schema")) defineSchema(driver, database, arguments.get("schema"));
 
             try (TypeDBSession session = driver.session(database, TypeDBSession.Type.DATA)) {
-                PoolBulkLoader bulkLoader = new PoolBulkLoader(filepaths, batchSize, transactionCount, session);
-                bulkLoader.load();
-            } catch (IOException | InterruptedException e) {
-                throw new RuntimeException(e);
+                if (arguments.containsKey("harness")) {
+                    System.out.println("ready");
+                    BufferedReader input = new BufferedReader(new InputStreamReader(System.in, UTF_8));
+                    if (!"start".equals(input.readLine())) throw new IllegalStateException("Expected start signal.");
+                }
+
+                // Files are loaded one at a time, as later files depend on earlier ones.
+                for (String filepath : filepaths) {
+                    long start = System.nanoTime();
+                    PoolBulkLoader bulkLoader = new PoolBulkLoader(new ArrayList<>(List.of(filepath)), batchSize, transactionCount, session);
+                    bulkLoader.load();
+                    double seconds = (System.nanoTime() - start) / 1e9;
+                    System.out.println("result\t" + filepath + "\t" + bulkLoader.queryCount() + "\t" + seconds);
+                }
             }
         }
     }
-}
\ No newline at end of file
+}
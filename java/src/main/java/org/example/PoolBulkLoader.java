@@ -12,12 +12,15 @@ import java.util.concurrent.CompletableFuture;
 import java.util.concurrent.ExecutorService;
 import java.util.concurrent.Executors;
 import java.util.concurrent.LinkedBlockingQueue;
+import java.util.concurrent.TimeUnit;
 import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.concurrent.atomic.AtomicLong;
 
 public class PoolBulkLoader {
     public final int transactionCount;
     public final int batchSize;
     private final AtomicBoolean hasError;
+    private final AtomicLong queryCount;
     private final TypeDBSession session;
     private final ArrayList<String> filepaths;
 
@@ -33,6 +36,11 @@ public class PoolBulkLoader {
         this.transactionCount = transactionCount;
         this.session = session;
         this.hasError = new AtomicBoolean(false);
+        this.queryCount = new AtomicLong(0);
+    }
+
+    public long queryCount() {
+        return queryCount.get();
     }
 
     public void load() throws InterruptedException, FileNotFoundException {
@@ -46,6 +54,9 @@ public class PoolBulkLoader {
 
         addBatches(queue);
 
+        // Failed loaders stop taking batches, so the queue is drained to leave room for every done signal.
+        if (hasError.get()) queue.clear();
+
         for (int i = 0; i < transactionCount; i++) {
             queue.put(Either.second(Done.INSTANCE));
         }
@@ -59,7 +70,11 @@ public class PoolBulkLoader {
 
         while (batchIterator.hasNext() && !hasError.get()) {
             List<String> batch = batchIterator.next();
-            queue.put(Either.first(batch));
+
+            // Blocking forever on a full queue would hang the load if every loader has failed.
+            while (!queue.offer(Either.first(batch), 1, TimeUnit.SECONDS)) {
+                if (hasError.get()) return;
+            }
         }
     }
 
@@ -77,6 +92,8 @@ public class PoolBulkLoader {
                         }
                         transaction.commit();
                     }
+
+                    queryCount.addAndGet(queries.first().size());
                 }
             } catch (Throwable e) {
                 hasError.set(true);
@@ -82,7 +82,7 @@ class PromiseQueue<T> {
     }
 }
 
-async function loadBatch(batch: Array<string>, session: TypeDBSession): Promise<void> {
+async function loadBatch(batch: Array<string>, session: TypeDBSession): Promise<number> {
     let transaction: TypeDBTransaction;
 
     try {
@@ -93,71 +93,123 @@ async function loadBatch(batch: Array<string>, session: TypeDBSession): Promise<
         }
 
         await transaction.commit();
+        return batch.length;
     } finally {
-        if (transaction.isOpen()) {
+        if (transaction?.isOpen()) {
             await transaction.close();
         }
     }
 }
 
-async function loadData(addresses: Array<string>, username: string, password: string): Promise<void> {
-    const database: string = "bulk-load-test";
-    const dataFiles: Array<string> = ["../dataset/entities.tql", "../dataset/relations.tql"];
-    const batchSize: number = 100;
+async function loadData(session: TypeDBSession, dataFiles: Array<string>, batchSize: number): Promise<number> {
+    let queryCount = 0;
+    let batchIterator = new BatchIterator(dataFiles, batchSize);
 
-    let credential: TypeDBCredential = new TypeDBCredential(username, password);
-    let driver: TypeDBDriver;
+    for await (let batch of batchIterator) {
+        queryCount += await loadBatch(batch, session);
+    }
 
-    try {
-        driver = await TypeDB.cloudDriver(addresses, credential);
-        let session: TypeDBSession;
+    return queryCount;
+}
 
-        try {
-            session = await driver.session(database, SessionType.DATA);
-            let batchIterator = new BatchIterator(dataFiles, batchSize);
+async function loadDataAsync(
+    session: TypeDBSession,
+    dataFile: string,
+    batchSize: number,
+    transactionCount: number,
+): Promise<number> {
+    let queryCount = 0;
+    let promiseQueue = new PromiseQueue<number>(transactionCount);
+    let batchIterator = new BatchIterator([dataFile], batchSize);
+
+    for await (let batch of batchIterator) {
+        queryCount += (await promiseQueue.put(loadBatch(batch, session))) || 0;
+    }
 
-            for await (let batch of batchIterator) {
-                await loadBatch(batch, session);
-            }
-        } finally { await session?.close() }
-    } finally { await driver?.close() }
+    for (let count of await promiseQueue.join()) {
+        queryCount += count;
+    }
+
+    return queryCount;
 }
 
-async function loadDataAsync(addresses: Array<string>, username: string, password: string): Promise<void> {
-    const database: string = "bulk-load-test";
-    const dataFiles: Array<string> = ["../dataset/entities.tql", "../dataset/relations.tql"];
-    const batchSize: number = 100;
+function parseArguments(args: Array<string>): Map<string, string> {
+    // Arguments match those passed by the Python test harness, which creates the database and schema itself, waits
+    // for "ready" once connected, and sends "start" when it begins timing. Without --harness the load starts at once.
+    let parsed = new Map<string, string>([
+        ["driver", "core"],
+        ["addresses", "localhost:1729"],
+        ["username", "admin"],
+        ["database", "bulk-load-test"],
+        ["files", "../dataset/entities.tql,../dataset/relations.tql"],
+        ["batch-size", "100"],
+        ["transaction-count", String(os.cpus().length)],
+    ]);
+
+    for (let i = 0; i < args.length; i++) {
+        if (!args[i].startsWith("--")) throw new Error(`Unexpected argument: ${args[i]}`);
+        let key = args[i].substring(2);
+
+        if (key == "harness") parsed.set(key, "true");
+        else if (i + 1 < args.length) parsed.set(key, args[++i]);
+        else throw new Error(`Missing value for argument: ${args[i]}`);
+    }
 
-    let credential: TypeDBCredential = new TypeDBCredential(username, password);
+    return parsed;
+}
+
+async function openDriver(args: Map<string, string>): Promise<TypeDBDriver> {
+    let addresses = args.get("addresses").split(",");
+
+    switch (args.get("driver")) {
+        case "core":
+            return TypeDB.coreDriver(addresses[0]);
+        case "cloud":
+            let credential = new TypeDBCredential(args.get("username"), process.env.TYPEDB_PASSWORD);
+            return TypeDB.cloudDriver(addresses, credential);
+        default:
+            throw new Error(`Unsupported driver type: ${args.get("driver")}`);
+    }
+}
+
+async function waitForStart(): Promise<void> {
+    let input = readline.createInterface(process.stdin);
+    let line = await new Promise<string>(resolve => input.once("line", resolve));
+    input.close();
+
+    if (line != "start") throw new Error("Expected start signal.");
+}
+
+async function main() {
+    const args = parseArguments(process.argv.slice(2));
+    const batchSize = Number(args.get("batch-size"));
+    const transactionCount = Number(args.get("transaction-count"));
     let driver: TypeDBDriver;
 
     try {
-        driver = await TypeDB.cloudDriver(addresses, credential);
+        driver = await openDriver(args);
         let session: TypeDBSession;
 
         try {
-            session = await driver.session(database, SessionType.DATA);
-
-            for (let dataFile of dataFiles) {
-                let queueSize = os.cpus().length;
-                let promiseQueue = new PromiseQueue(queueSize);
-                let batchIterator = new BatchIterator([dataFile], batchSize);
+            session = await driver.session(args.get("database"), SessionType.DATA);
 
-                for await (let batch of batchIterator) {
-                    await promiseQueue.put(loadBatch(batch, session));
-                }
+            if (args.has("harness")) {
+                console.log("ready");
+                await waitForStart();
+            }
 
-                await promiseQueue.join();
+            // Files are loaded one at a time, as later files depend on earlier ones.
+            for (let dataFile of args.get("files").split(",")) {
+                let start = process.hrtime.bigint();
+                let queryCount = await loadDataAsync(session, dataFile, batchSize, transactionCount);
+                let seconds = Number(process.hrtime.bigint() - start) / 1e9;
+                console.log(`result\t${dataFile}\t${queryCount}\t${seconds}`);
             }
         } finally { await session?.close() }
     } finally { await driver?.close() }
 }
 
-async function main() {
-    const addresses = ["localhost:1729"];
-    const username = "null";
-    const password = "null";
-    await loadDataAsync(addresses, username, password);
-}
-
-main();
+main().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
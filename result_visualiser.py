@@ -1,14 +1,49 @@
+import glob
+import math
 import os
 import matplotlib.pyplot as pyplot
+from src.stats import describe
 from src.utils import Config
 
 
 config = Config()
 results: list[dict[str, float]] = list()
+results_dir = f"{os.getcwd()}/{config.results_dir}"
+# Defaults stand in for configuration columns missing from results written before they existed, e.g. every load was
+# uncoalesced before coalescing_factor.
+configuration_defaults = {"loader_type": "", "batch_size": "", "transaction_count": "", "coalescing_factor": 1.0}
 
-for file in config.result_files:
-    result_path = f"{os.getcwd()}/{config.results_dir}/{file}.csv"
 
+def series_key(result: dict, excluded: str) -> tuple:
+    # Series are keyed by every configuration column but the plotted one, so no two configurations share a point, and
+    # only trials of the same configuration are combined.
+    return tuple(
+        (column, result.get(column, default)) for column, default in configuration_defaults.items() if column != excluded
+    )
+
+
+def series_label(key: tuple, varying: set[str]) -> str:
+    return ", ".join(
+        f"{column.replace('_', ' ')} {value if type(value) is str else int(value)}"
+        for column, value in key if column in varying or column == config.series_variable
+    )
+
+
+def varying_columns(keys: list[tuple]) -> set[str]:
+    return {column for column, _ in keys[0] if len({dict(key)[column] for key in keys}) > 1} if keys else set()
+
+
+# Without listed result files, every results CSV is aggregated, so trials from separate runs of a configuration are
+# combined. Timelines, skipped tests and summaries are written alongside results, and are not results themselves.
+if config.result_files:
+    result_paths = [f"{results_dir}/{file}.csv" for file in config.result_files]
+else:
+    result_paths = [
+        path for path in sorted(glob.glob(f"{results_dir}/*.csv"))
+        if not path.endswith(("_timeline.csv", "_skipped.csv", "_summary.csv"))
+    ]
+
+for result_path in result_paths:
     with open(result_path, "r") as lines:
         header = next(lines).strip().split(",")
 
@@ -19,24 +54,72 @@ for file in config.result_files:
             result.update({key: value for key, value in zip(header, entry) if key in non_numeric_keys})
             results.append(result)
 
+# Budgeted and partially loaded runs, e.g. early rungs of successive halving or tests stopped at steady state, measure
+# only part of the load, so only full runs are plotted. Results written before these columns existed are all full.
+results = [result for result in results if result.get("query_budget", 0) == 0 and result.get("partial", 0) == 0]
+
 for result in results:
     result["total_count"] = sum(result[f"{file}_count"] for file in config.data_files)
     result["total_time"] = sum(result[f"{file}_time"] for file in config.data_files)
-    result["total_rate"] = result["total_count"] / result["total_time"]
+    result["total_rate"] = result["total_count"] / result["total_time"] if result["total_time"] > 0 else 0.0
+
+
+# Trials of the same series and axis value are combined into one point, with the confidence interval as error bars.
+series_rates: dict[tuple, dict[float, list[float]]] = dict()
+
+for result in results:
+    axis_rates = series_rates.setdefault(series_key(result, config.axis_variable), dict())
+    axis_rates.setdefault(result[config.axis_variable], list()).append(result["total_rate"])
+
+figure, (rate_axes, speedup_axes, efficiency_axes) = pyplot.subplots(1, 3, figsize=(18, 5))
+
+rate_varying = varying_columns(list(series_rates))
+
+for key, axis_rates in sorted(series_rates.items()):
+    axis_values = sorted(axis_rates)
+    means: list[float] = list()
+    errors: list[float] = list()
+
+    for axis_value in axis_values:
+        mean, _, half_width = describe(axis_rates[axis_value])
+        means.append(mean)
+        errors.append(0.0 if math.isnan(half_width) else half_width)
+
+    rate_axes.errorbar(axis_values, means, yerr=errors, label=series_label(key, rate_varying), marker="o", capsize=3)
+
+rate_axes.set_xlabel(config.axis_variable.replace("_", " "))
+rate_axes.set_ylabel("load rate (query / s)")
+rate_axes.legend()
+
+# Speedup and efficiency are relative to the same configuration run with a single transaction, and series without that
+# baseline are left out.
+scaling_rates: dict[tuple, dict[float, list[float]]] = dict()
+
+for result in results:
+    transaction_rates = scaling_rates.setdefault(series_key(result, "transaction_count"), dict())
+    transaction_rates.setdefault(result["transaction_count"], list()).append(result["total_rate"])
+
+scaling_varying = varying_columns(list(scaling_rates))
+
+for key, transaction_rates in sorted(scaling_rates.items()):
+    if 1 not in transaction_rates:
+        continue
 
-for series_value, loader_type in sorted({(result[config.series_variable], result["loader_type"]) for result in results}):
-    axis_values = list()
-    total_rates = list()
+    baseline, _, _ = describe(transaction_rates[1])
 
-    for result in results:
-        if result[config.series_variable] == series_value and result["loader_type"] == loader_type:
-            axis_values.append(result[config.axis_variable])
-            total_rates.append(result["total_rate"])
+    if baseline <= 0:
+        continue
 
-    series_label = f"""{loader_type} {int(series_value)}"""
-    pyplot.plot(axis_values, total_rates, label=series_label, marker="o")
+    transaction_counts = sorted(transaction_rates)
+    speedups = [describe(transaction_rates[transaction_count])[0] / baseline for transaction_count in transaction_counts]
+    efficiencies = [speedup / transaction_count for speedup, transaction_count in zip(speedups, transaction_counts)]
+    speedup_axes.plot(transaction_counts, speedups, label=series_label(key, scaling_varying), marker="o")
+    efficiency_axes.plot(transaction_counts, efficiencies, label=series_label(key, scaling_varying), marker="o")
 
-pyplot.xlabel(config.axis_variable.replace("_", " "))
-pyplot.ylabel("load rate (query / s)")
-pyplot.legend(title=config.series_variable.replace("_", " "))
+speedup_axes.set_xlabel("transaction count")
+speedup_axes.set_ylabel("speedup")
+speedup_axes.legend()
+efficiency_axes.set_xlabel("transaction count")
+efficiency_axes.set_ylabel("parallel efficiency")
+efficiency_axes.legend()
 pyplot.show()
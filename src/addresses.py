@@ -0,0 +1,62 @@
+from src.utils import AddressPolicy
+
+
+class AddressSelector:
+    # Latency estimates are exponentially weighted so the policy follows nodes as they slow down or recover.
+    _latency_smoothing = 0.3
+
+    def __init__(self, addresses: list[str], policy: AddressPolicy, weights: list[float]):
+        if policy is AddressPolicy.WEIGHTED and len(weights) != len(addresses):
+            raise ValueError(f"Address weights must match addresses, not: {weights}")
+
+        self.addresses = addresses
+        self.policy = policy
+        self._weights = weights
+        self._latencies: dict[str, float] = dict()
+        self._credits = {address: 0.0 for address in addresses}
+
+    @staticmethod
+    def label(addresses: str | list[str]) -> str:
+        if type(addresses) is str:
+            return addresses
+        else:
+            return "|".join(addresses)
+
+    def _current_weights(self) -> dict[str, float]:
+        match self.policy:
+            case AddressPolicy.WEIGHTED:
+                return dict(zip(self.addresses, self._weights))
+            case AddressPolicy.LEAST_LATENCY:
+                if not self._latencies:
+                    return {address: 1.0 for address in self.addresses}
+
+                default_latency = sum(self._latencies.values()) / len(self._latencies)
+                return {address: 1 / max(self._latencies.get(address, default_latency), 1e-6) for address in self.addresses}
+            case _:
+                return {address: 1.0 for address in self.addresses}
+
+    def next(self) -> str | list[str]:
+        if self.policy is AddressPolicy.NONE:
+            return self.addresses
+
+        # Smooth weighted round-robin: every address earns credit in proportion to its weight and the richest address
+        # is chosen and pays back the total, which interleaves addresses instead of sending runs to each in turn.
+        weights = self._current_weights()
+        total_weight = sum(weights.values())
+
+        for address in self.addresses:
+            self._credits[address] += weights[address]
+
+        chosen = max(self.addresses, key=lambda address: self._credits[address])
+        self._credits[chosen] -= total_weight
+        return [chosen]
+
+    def assign(self, count: int) -> list[str | list[str]]:
+        return [self.next() for _ in range(count)]
+
+    def observe(self, address: str, latency: float) -> None:
+        if address not in self._latencies:
+            self._latencies[address] = latency
+        else:
+            smoothing = self._latency_smoothing
+            self._latencies[address] = smoothing * latency + (1 - smoothing) * self._latencies[address]
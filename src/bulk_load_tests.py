@@ -1,67 +1,295 @@
 import os
+import statistics
 import time
 from collections.abc import Iterator
+from random import Random
 from typedb.api.connection.session import SessionType
 from typedb.api.connection.transaction import TransactionType
 from typedb.common.exception import TypeDBDriverException
-from src.bulk_loaders import BulkLoader, CarouselBulkLoader, PoolBulkLoader
-from src.utils import Logger, LoaderType, Config
+from src.checkpoint import Checkpoint
+from src.bulk_loaders import (
+    BulkLoader,
+    CarouselBulkLoader,
+    PoolBulkLoader,
+    ShardedPoolBulkLoader,
+    AdaptiveBulkLoader,
+    PipelinedCarouselBulkLoader,
+    AsyncBulkLoader,
+    HybridPoolBulkLoader,
+    JavaPoolBulkLoader,
+    NodeAsyncBulkLoader,
+)
+from src.columnar import row_count
+from src.iid_cache import init_iid_cache
+from src.metrics import LoadMetrics
+from src import profiler
+from src.profiler import ResourceProfiler
+from src.resources import LoaderResources
+from src.snapshots import Snapshot, init_snapshot
+from src.steady_state import SteadyStateMonitor
+from src.utils import AddressPolicy, Logger, LoaderType, Config, MeasurementMode, SweepStrategy
 
 
-def init_loader(loader_type: LoaderType, file_paths: str | list[str], batch_size: int, transaction_count: int, config: Config) -> BulkLoader:
+def init_loader(
+    loader_type: LoaderType,
+    file_paths: str | list[str],
+    batch_size: int,
+    transaction_count: int,
+    config: Config,
+    resources: LoaderResources,
+    checkpoint: Checkpoint = None,
+    coalescing_factor: int = 1,
+) -> BulkLoader:
     match loader_type:
         case LoaderType.CAROUSEL:
             constructor = CarouselBulkLoader
         case LoaderType.POOL:
             constructor = PoolBulkLoader
+        case LoaderType.SHARDED_POOL:
+            constructor = ShardedPoolBulkLoader
+        case LoaderType.ADAPTIVE:
+            constructor = AdaptiveBulkLoader
+        case LoaderType.PIPELINED_CAROUSEL:
+            constructor = PipelinedCarouselBulkLoader
+        case LoaderType.ASYNC:
+            constructor = AsyncBulkLoader
+        case LoaderType.HYBRID_POOL:
+            constructor = HybridPoolBulkLoader
+        case LoaderType.JAVA_POOL:
+            constructor = JavaPoolBulkLoader
+        case LoaderType.NODE_ASYNC:
+            constructor = NodeAsyncBulkLoader
 
     kwargs = {
         "file_paths": file_paths,
         "batch_size": batch_size,
         "transaction_count": transaction_count,
         "config": config,
+        "resources": resources,
+        "checkpoint": checkpoint,
+        "coalescing_factor": coalescing_factor,
     }
 
     return constructor(**kwargs)
 
 
 class BulkLoadTest:
-    def __init__(self, loader_type: LoaderType, batch_size: int, transaction_count: int, config: Config, logger: Logger = None):
+    def __init__(
+        self,
+        loader_type: LoaderType,
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        logger: Logger = None,
+        coalescing_factor: int = 1,
+        resources: LoaderResources = None,
+        query_budget: int = None,
+        snapshot: Snapshot = None,
+        data_files: list[str] = None,
+        trial: int = 0,
+        rung: int = 0,
+    ):
         self.loader_type = loader_type
         self.batch_size = batch_size
         self.transaction_count = transaction_count
+        self.coalescing_factor = coalescing_factor
         self.config = config
+        self.resources = resources
+        self.query_budget = query_budget
+        self.snapshot = snapshot
+        self.trial = trial
+        self.rung = rung
+        self.dead_letter_count = 0
+
+        if data_files is None:
+            self.data_files = self.config.data_files
+        else:
+            self.data_files = data_files
 
         if logger is None:
             self.logger = Logger()
         else:
             self.logger = logger
 
+    @property
+    def checkpoint(self) -> Checkpoint:
+        return Checkpoint(f"{os.getcwd()}/{self.config.logs_dir}/{self.config.checkpoint_file}.txt")
+
+    @property
+    def checkpoint_header(self) -> list[str]:
+        return Checkpoint.test_header(
+            self.loader_type.value, self.batch_size, self.transaction_count, self.coalescing_factor, self.trial,
+        )
+
+    def data_path(self, file: str) -> str:
+        return f"{os.getcwd()}/{self.config.dataset_dir}/{file}{self.config.data_suffix}"
+
     @property
     def schema(self) -> str:
         schema_path = f"{os.getcwd()}/{self.config.dataset_dir}/{self.config.schema_file}.tql"
         return open(schema_path, "r").read()
 
-    def run(self) -> dict:
+    def _log_trajectory(self, trajectory: list[dict]) -> None:
+        self.logger.info(f"  Adaptive trajectory:")
+
+        for generation, step in enumerate(trajectory):
+            self.logger.info(
+                f"    Generation {generation}: batch size {step['batch_size']}, transaction count {step['transaction_count']}, "
+                f"rate {step['rate']:.1f} query / s, commit latency {step['commit_latency']:.4f} s, failures {step['failures']}"
+            )
+
+    def _address_summary(self, file: str, address_metrics: dict[str, LoadMetrics]) -> dict[str, float]:
+        summary: dict[str, float] = dict()
+
+        if self.config.address_policy is AddressPolicy.NONE:
+            return summary
+
+        for address in self.config.addresses:
+            summary.update(address_metrics.get(address, LoadMetrics()).address_summary(file, address))
+
+        return summary
+
+    def _profiler(self, file: str, resources: LoaderResources, bulk_loader: BulkLoader) -> ResourceProfiler | None:
+        if not self.config.profile:
+            return None
+        elif not profiler.available():
+            self.logger.warn(f"  Process statistics unavailable without psutil or /proc. Not profiling.")
+            return None
+
+        trace_path = f"{os.getcwd()}/{self.config.logs_dir}/{self.config.profile_file}.csv"
+        test_key = f"{','.join(self.checkpoint_header)},{file}"
+        return ResourceProfiler(self.config.profile_interval, trace_path, test_key, resources.process_ids, lambda: bulk_loader.queues)
+
+    def _effective_query_budget(self, file: str) -> int | None:
+        # An explicit budget applies in either mode, so sweeps can run cheap partial tests of full-mode configs, but only
+        # to the last file, as a budgeted dependency file would have to be completed with the same config anyway.
+        if self.query_budget is not None:
+            return self.query_budget if file == self.data_files[-1] else None
+        elif self.config.measurement_mode is MeasurementMode.STEADY_STATE and self.config.query_budget > 0:
+            return self.config.query_budget
+        else:
+            return None
+
+    def _log_steady_state(self, monitor: SteadyStateMonitor, bulk_loader: BulkLoader) -> None:
+        rate, half_width = monitor.rate
+        self.logger.info(f"  Steady-state rate: {rate:.1f} ± {half_width:.1f} query / s over {len(monitor.samples)} samples")
+
+        if monitor.stopped:
+            self.logger.info(f"  Measurement stopped early on: {monitor.stop_reason}")
+        elif bulk_loader.budget_exhausted:
+            self.logger.info(f"  Measurement stopped early on: query budget")
+
+    def _complete(self, data_path: str, resources: LoaderResources, checkpoint: Checkpoint) -> float:
+        self.logger.info(f"  Completing remaining queries for later data files.")
+        start = time.time()
+        bulk_loader = init_loader(
+            self.loader_type,
+            data_path,
+            self.batch_size,
+            self.transaction_count,
+            self.config,
+            resources,
+            checkpoint,
+            self.coalescing_factor,
+        )
+        bulk_loader.setup()
+        bulk_loader.load()
+        completion_time = time.time() - start
+        self.logger.info(f"  Completed {bulk_loader.queries_run} remaining queries in: {completion_time} s")
+
+        if bulk_loader.dead_letters:
+            self._write_dead_letters(bulk_loader.dead_letters)
+
+        return completion_time
+
+    def _write_dead_letters(self, dead_letters: list[list[str]]) -> None:
+        dead_letter_path = f"{os.getcwd()}/{self.config.logs_dir}/{self.config.dead_letter_file}.tql"
+        self.logger.warn(f"  Batches failed after maximum attempts: {len(dead_letters)}")
+        self.logger.warn(f"  Writing failed batches to: {dead_letter_path}")
+        os.makedirs(f"{os.getcwd()}/{self.config.logs_dir}", exist_ok=True)
+
+        with open(dead_letter_path, "a") as output:
+            for batch in dead_letters:
+                for query in batch:
+                    output.write(f"{query.rstrip()}\n")
+
+    def run(self, resume: bool = False) -> dict:
+        if self.resources is not None:
+            return self._run(self.resources, resume)
+
+        resources = LoaderResources(self.config)
+
+        try:
+            return self._run(resources, resume)
+        finally:
+            resources.close()
+
+    def _run(self, resources: LoaderResources, resume: bool) -> dict:
         attempt_count = 1
+        checkpoint = self.checkpoint
+        iid_cache = init_iid_cache(self.config)
         self.logger.info(f"Starting test.")
 
+        if resume and checkpoint.header() != self.checkpoint_header:
+            self.logger.warn(f"Checkpoint does not match test configuration. Not resuming.")
+            resume = False
+
         while attempt_count <= self.config.maximum_test_attempts:
             self.logger.info(f"Using loader: {self.loader_type.value}")
             self.logger.info(f"Using batch size: {self.batch_size}")
             self.logger.info(f"Using transaction count: {self.transaction_count}")
+            self.logger.info(f"Using coalescing factor: {self.coalescing_factor}")
+
+            if self.config.trial_count > 1:
+                self.logger.info(f"Running trial: {self.trial + 1} of {self.config.trial_count}")
+
+            if self.query_budget is not None:
+                self.logger.info(f"Using query budget for final data file: {self.query_budget}")
 
-            if self.loader_type is LoaderType.POOL and self.transaction_count > os.cpu_count():
+            if self.config.address_policy is not AddressPolicy.NONE:
+                self.logger.info(f"Using address policy: {self.config.address_policy.value}")
+
+            if self.config.iid_cache:
+                self.logger.info(f"Using IID cache for attribute: {self.config.iid_cache_attribute}")
+
+            if self.loader_type is LoaderType.POOL:
+                self.logger.info(f"Using partitioning mode: {self.config.partitioning_mode.value}")
+
+            if self.loader_type in (LoaderType.POOL, LoaderType.SHARDED_POOL) and self.transaction_count > os.cpu_count():
                 self.logger.warn(f"Transaction count exceeds CPU count.")
 
+            self.dead_letter_count = 0
             result = {
                 "loader_type": self.loader_type.value,
                 "batch_size": self.batch_size,
                 "transaction_count": self.transaction_count,
+                "coalescing_factor": self.coalescing_factor,
+                "trial": self.trial,
+                "query_budget": 0 if self.query_budget is None else self.query_budget,
+                "rung": self.rung,
+                "partial": 0,
+                "process_count": 0,
+                "thread_count": 0,
             }
 
             try:
-                with self.config.driver_type.init(self.config.addresses, self.config.username, self.config.password) as driver:
+                if resume:
+                    self.logger.info(f"  Resuming from checkpoint: {checkpoint.path}")
+                elif self.snapshot is not None:
+                    # Fixture files are marked committed, so they are skipped exactly as on resume and record no timings.
+                    resources.reset()
+                    self.logger.info(f"  Restoring snapshot of files: {', '.join(self.snapshot.files)}")
+                    self.snapshot.restore(resources)
+                    checkpoint.reset(self.checkpoint_header)
+
+                    if not self.snapshot.preserves_iids:
+                        iid_cache.reset()
+
+                    for file in self.snapshot.files:
+                        checkpoint.complete(self.data_path(file))
+                else:
+                    resources.reset()
+                    driver = resources.driver
                     self.logger.info(f"  Creating database.")
 
                     if driver.databases.contains(self.config.database):
@@ -75,19 +303,135 @@ class BulkLoadTest:
                             transaction.query.define(self.schema)
                             transaction.commit()
 
-                for file in self.config.data_files:
-                    self.logger.info(f"  Loading data from file: {file}.tql")
+                    checkpoint.reset(self.checkpoint_header)
+                    iid_cache.reset()
+
+                for file in self.data_files:
                     query_count = 0
-                    data_path = f"{os.getcwd()}/{self.config.dataset_dir}/{file}.tql"
+                    data_file = f"{file}{self.config.data_suffix}"
+                    data_path = self.data_path(file)
+
+                    if checkpoint.is_complete(data_path):
+                        self.logger.info(f"  Skipping committed file: {data_file}")
+                        result[f"{file}_time"] = 0
+                        result[f"{file}_setup_time"] = 0
+                        result[f"{file}_completion_time"] = 0
+                        result[f"{file}_dead_letters"] = 0
+                        result[f"{file}_count"] = query_count
+                        result.update(LoadMetrics().summary(file))
+                        result.update({column: 0 for column in SteadyStateMonitor.columns(file)})
+                        result.update({column: 0 for column in ResourceProfiler.columns(file)})
+                        result.update(self._address_summary(file, dict()))
+                        result[f"{file}_timeline"] = list()
+                        continue
+
+                    if iid_cache.enabled:
+                        compact_start = time.time()
+                        cached_count = iid_cache.compact()
+                        self.logger.info(f"  Compacted IID cache of {cached_count} keys in: {time.time() - compact_start} s")
+
+                    self.logger.info(f"  Loading data from file: {data_file}")
+                    setup_start = time.time()
+                    bulk_loader = init_loader(
+                        self.loader_type,
+                        data_path,
+                        self.batch_size,
+                        self.transaction_count,
+                        self.config,
+                        resources,
+                        checkpoint,
+                        self.coalescing_factor,
+                    )
+                    bulk_loader.query_budget = self._effective_query_budget(file)
+                    bulk_loader.setup()
+                    setup_time = time.time() - setup_start
+                    self.logger.info(f"  Setup complete in: {setup_time} s")
+                    self.logger.info(f"  Queries to load: {bulk_loader.query_count}")
+                    self.logger.info(f"  Using processes: {bulk_loader.process_count}, threads per process: {bulk_loader.thread_count}")
+                    result["process_count"] = bulk_loader.process_count
+                    result["thread_count"] = bulk_loader.thread_count
+                    monitor = SteadyStateMonitor(checkpoint, data_path, self.config, bulk_loader.stop)
+                    resource_profiler = self._profiler(file, resources, bulk_loader)
                     start = time.time()
-                    bulk_loader = init_loader(self.loader_type, data_path, self.batch_size, self.transaction_count, self.config)
-                    bulk_loader.load()
+                    monitor.start()
+
+                    if resource_profiler is not None:
+                        resource_profiler.start()
+
+                    try:
+                        bulk_loader.load()
+                    finally:
+                        monitor.close()
+
+                        if resource_profiler is not None:
+                            resource_profiler.close()
+
                     query_count += bulk_loader.queries_run
                     time_elapsed = time.time() - start
                     result[f"{file}_time"] = time_elapsed
+                    result[f"{file}_setup_time"] = setup_time
                     result[f"{file}_count"] = query_count
+                    result.update(bulk_loader.metrics.summary(file))
+                    result.update(monitor.summary(file))
+
+                    if resource_profiler is not None:
+                        result.update(resource_profiler.summary(file))
+
+                    result.update(self._address_summary(file, bulk_loader.address_metrics))
+                    result[f"{file}_timeline"] = bulk_loader.metrics.committed_per_second(start)
                     self.logger.info(f"  Data loading complete in: {time_elapsed} s")
                     self.logger.info(f"  Total queries run: {query_count}")
+                    self._log_steady_state(monitor, bulk_loader)
+                    self.logger.info(
+                        f"  Input stalls: {bulk_loader.metrics.counts['input_stalls']}, "
+                        f"longest wait {bulk_loader.metrics.histograms['input_wait'].maximum:.4f} s"
+                    )
+
+                    for worker, metrics in enumerate(bulk_loader.worker_metrics):
+                        self.logger.info(
+                            f"  Worker {worker}: commit failures {metrics.counts['commit_failures']}, "
+                            f"retries {metrics.counts['retries']}"
+                        )
+
+                    for address, metrics in bulk_loader.address_metrics.items():
+                        self.logger.info(
+                            f"  Address {address}: committed {sum(metrics.timeline.values())}, "
+                            f"commit p50 {metrics.histograms['commit'].percentile(50):.4f} s"
+                        )
+
+                    resources.observe(bulk_loader.address_metrics)
+
+                    if isinstance(bulk_loader, AdaptiveBulkLoader):
+                        self._log_trajectory(bulk_loader.trajectory)
+
+                    if bulk_loader.dead_letters:
+                        self._write_dead_letters(bulk_loader.dead_letters)
+
+                    # Files are loaded in dependency order, so a file stopped early is completed unmeasured if any later
+                    # file follows it, e.g. relations need every entity, while the last file is left partially loaded.
+                    result[f"{file}_completion_time"] = 0
+                    stopped = monitor.stopped or bulk_loader.budget_exhausted
+
+                    if stopped and file != self.data_files[-1]:
+                        result[f"{file}_completion_time"] = self._complete(data_path, resources, checkpoint)
+
+                    # Dead-lettered batches are written out for inspection and cost only their own lines, so the result
+                    # stands and records how many lines were lost.
+                    result[f"{file}_dead_letters"] = checkpoint.dead_lettered(data_path)
+                    self.dead_letter_count += result[f"{file}_dead_letters"]
+
+                    if stopped and file == self.data_files[-1]:
+                        self.logger.info(f"  Leaving final data file partially loaded: {data_file}")
+                        result["partial"] = 1
+                        continue
+
+                    # Later files may depend on this one, e.g. relations on entities, so they never load onto lines that
+                    # were never attempted.
+                    if checkpoint.pending(data_path, row_count(data_path)):
+                        self.logger.error(f"  Data file not fully committed: {data_file}")
+                        raise RuntimeError(f"Data file not fully committed: {data_file}")
+
+                    checkpoint.complete(data_path)
 
                 return result
             except TypeDBDriverException as exception:
@@ -103,20 +447,212 @@ class BulkLoadTest:
 class BulkLoadTestBatch:
     def __init__(self, config: Config, logger: Logger = None):
         self.config = config
+        self.skipped: list[dict] = list()
+        self._start = time.time()
+        self._snapshot: Snapshot | None = None
 
         if logger is None:
             self.logger = Logger()
         else:
             self.logger = logger
 
+    @property
+    def grid(self) -> list[tuple[LoaderType, int, int, int]]:
+        return [
+            (loader_type, batch_size, transaction_count, coalescing_factor)
+            for loader_type in self.config.loader_types
+            for batch_size in self.config.batch_sizes
+            for transaction_count in self.config.transaction_counts
+            for coalescing_factor in self.config.coalescing_factors
+            # External loaders send queries as they are, so they are only run once, without coalescing.
+            if not loader_type.external or coalescing_factor == 1
+        ]
+
+    def trials(self, points: list[tuple[LoaderType, int, int, int]]) -> list[tuple[tuple[LoaderType, int, int, int], int]]:
+        # Repeated trials are interleaved in a seeded random order, so drift over a batch, e.g. from a growing server
+        # cache or a noisy neighbour, spreads across configurations instead of biasing whichever ran last.
+        trials = [(point, trial) for trial in range(self.config.trial_count) for point in points]
+
+        if self.config.trial_count > 1:
+            Random(self.config.trial_seed).shuffle(trials)
+
+        return trials
+
+    @staticmethod
+    def throughput(result: dict, files: list[str]) -> float:
+        time_elapsed = sum(result[f"{file}_time"] for file in files)
+        return sum(result[f"{file}_count"] for file in files) / time_elapsed if time_elapsed > 0 else 0.0
+
     def run(self) -> Iterator[dict]:
-        for loader_type in self.config.loader_types:
-            for batch_size in self.config.batch_sizes:
-                for transaction_count in self.config.transaction_counts:
-                    test = BulkLoadTest(loader_type, batch_size, transaction_count, self.config, self.logger)
+        # One set of connections and worker processes serves the whole batch, and is reset between tests.
+        resources = LoaderResources(self.config)
+        self._start = time.time()
 
-                    try:
-                        result = test.run()
-                        yield result
-                    except RuntimeError:
-                        continue
+        try:
+            self._snapshot = init_snapshot(self.config, self.logger)
+
+            if self._snapshot is not None:
+                self._capture(resources)
+
+            match self.config.sweep_strategy:
+                case SweepStrategy.GRID:
+                    yield from self._run(resources)
+                case SweepStrategy.SUCCESSIVE_HALVING:
+                    yield from self._run_successive_halving(resources)
+        finally:
+            resources.close()
+
+    def _skip(
+        self,
+        point: tuple[LoaderType, int, int, int],
+        rung: int,
+        reason: str,
+        trial: int = None,
+        dead_letters: int = 0,
+    ) -> None:
+        # Points eliminated by successive halving are skipped for every trial, so they are recorded without one.
+        loader_type, batch_size, transaction_count, coalescing_factor = point
+        trial_label = "" if trial is None else f", trial {trial}"
+        self.logger.info(f"Skipping test: {loader_type.value}, {batch_size}, {transaction_count}, {coalescing_factor}{trial_label} ({reason})")
+
+        self.skipped.append({
+            "loader_type": loader_type.value,
+            "batch_size": batch_size,
+            "transaction_count": transaction_count,
+            "coalescing_factor": coalescing_factor,
+            "trial": trial,
+            "rung": rung,
+            "reason": reason,
+            "dead_letters": dead_letters,
+        })
+
+    def _capture(self, resources: LoaderResources) -> None:
+        # The fixture is loaded once, by the first test in the grid, and its own timings are not part of the results.
+        loader_type, batch_size, transaction_count, coalescing_factor = self.grid[0]
+        self.logger.info(f"Loading snapshot fixture: {', '.join(self._snapshot.files)}")
+
+        fixture = BulkLoadTest(
+            loader_type,
+            batch_size,
+            transaction_count,
+            self.config,
+            self.logger,
+            coalescing_factor,
+            resources,
+            data_files=self._snapshot.files,
+        )
+
+        fixture.run()
+        self._snapshot.capture(resources)
+        self.logger.info(f"Captured snapshot of fixture.")
+
+    def _out_of_time(self) -> bool:
+        return 0 < self.config.sweep_time_budget <= time.time() - self._start
+
+    def _run(self, resources: LoaderResources) -> Iterator[dict]:
+        resume_header = None
+
+        if self.config.resume:
+            resume_header = Checkpoint(f"{os.getcwd()}/{self.config.logs_dir}/{self.config.checkpoint_file}.txt").header()
+            headers = [Checkpoint.test_header(point[0].value, *point[1:], trial) for point, trial in self.trials(self.grid)]
+
+            if resume_header not in headers:
+                self.logger.warn(f"No checkpoint found for any test in batch. Running all tests.")
+                resume_header = None
+
+        for point, trial in self.trials(self.grid):
+            loader_type, batch_size, transaction_count, coalescing_factor = point
+            test = BulkLoadTest(
+                loader_type,
+                batch_size,
+                transaction_count,
+                self.config,
+                self.logger,
+                coalescing_factor,
+                resources,
+                snapshot=self._snapshot,
+                trial=trial,
+            )
+            resume = False
+
+            if resume_header is not None:
+                if test.checkpoint_header != resume_header:
+                    continue
+
+                resume = True
+                resume_header = None
+
+            if self._out_of_time():
+                self._skip(point, 0, "time budget", trial)
+                continue
+
+            try:
+                result = test.run(resume)
+                yield result
+            except RuntimeError:
+                self._skip(point, 0, "failed", trial, test.dead_letter_count)
+                continue
+
+    def _run_successive_halving(self, resources: LoaderResources) -> Iterator[dict]:
+        # Every surviving point loads the last data file on a query budget, the fastest 1 / halving_factor go on to a
+        # budget halving_factor times larger, and the last survivor is loaded in full. Earlier files are dependencies,
+        # so each test loads them in full with its own config, unless the snapshot fixture restores them, and only with
+        # a snapshot does a bad corner cost no more than a small budgeted run.
+        if self.config.resume:
+            self.logger.warn(f"Resuming is not supported by successive halving. Running all tests.")
+
+        if self._snapshot is None and len(self.config.data_files) > 1:
+            self.logger.warn(f"Every halving test loads {', '.join(self.config.data_files[:-1])} in full. Set snapshot_mode to avoid this.")
+
+        points = self.grid
+        query_budget = self.config.halving_minimum_queries
+        rung = 0
+
+        while points:
+            final = len(points) == 1
+            throughputs: dict[tuple, list[float]] = dict()
+            self.logger.info(f"Starting rung {rung} with {len(points)} tests, query budget: {'full' if final else query_budget}")
+
+            for point, trial in self.trials(points):
+                if self._out_of_time():
+                    self._skip(point, rung, "time budget", trial)
+                    continue
+
+                loader_type, batch_size, transaction_count, coalescing_factor = point
+                test = BulkLoadTest(
+                    loader_type,
+                    batch_size,
+                    transaction_count,
+                    self.config,
+                    self.logger,
+                    coalescing_factor,
+                    resources,
+                    None if final else query_budget,
+                    self._snapshot,
+                    trial=trial,
+                    rung=rung,
+                )
+
+                try:
+                    result = test.run()
+                except RuntimeError:
+                    self._skip(point, rung, "failed", trial, test.dead_letter_count)
+                    continue
+
+                throughputs.setdefault(point, list()).append(self.throughput(result, self.config.data_files))
+                yield result
+
+            if final:
+                break
+
+            # Points are ranked by their mean over trials, so one noisy trial is less likely to eliminate the optimum.
+            means = {point: statistics.fmean(point_throughputs) for point, point_throughputs in throughputs.items()}
+            ranked = sorted(means, key=lambda point: means[point], reverse=True)
+            survivors = ranked[:max(1, -(-len(ranked) // self.config.halving_factor))]
+
+            for point in ranked[len(survivors):]:
+                self._skip(point, rung + 1, f"eliminated at rung {rung} with {means[point]:.1f} query / s")
+
+            points = survivors
+            query_budget *= self.config.halving_factor
+            rung += 1
@@ -1,18 +1,117 @@
+import asyncio
+import mmap
 import multiprocessing.connection
+import queue as queues
+import os
+import re
+import subprocess
+import threading
+import time
+import zlib
 from abc import ABC, abstractmethod
 from collections import deque
 from collections.abc import Iterator
-from multiprocessing import Pool, Queue, Manager
-from typedb.api.connection.session import SessionType
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import Queue
+from multiprocessing.pool import AsyncResult
+from typedb.api.connection.session import TypeDBSession
 from typedb.api.connection.transaction import TransactionType, TypeDBTransaction
 from typedb.common.exception import TypeDBDriverException
-from src.utils import DriverType, Config, LoaderType
+from src.addresses import AddressSelector
+from src.checkpoint import Checkpoint
+from src.coalescing import QueryCoalescer
+from src.iid_cache import IIDCache, init_iid_cache
+from src.columnar import ColumnarDataset, ColumnarRows, columnar_batches, is_columnar, row_count
+from src.inputs import ReadAhead, is_compressed, open_data
+from src.line_index import LineIndex, split_ranges
+from src.metrics import LoadMetrics
+from src.resources import LoaderResources, worker_session
+from src.simulation import SimulationModel
+from src.utils import DriverType, Config, LoaderType, RetryPolicy, PartitioningMode
 from src.mp_socket_client import socket_client
 multiprocessing.connection.SocketClient = socket_client(reattempt_wait=0.01)
 
+_render_chunk_size = 1 << 12
+
+
+def _insert_queries(
+    transaction: TypeDBTransaction,
+    queries: list[str],
+    coalescer: QueryCoalescer,
+    iid_cache: IIDCache,
+    captured: list[tuple[int, str]],
+) -> None:
+    # A merged match finds nothing if any one of its clauses does, so a merged query that inserts nothing is followed by
+    # its originals, which insert whatever their own matches find, just as they would uncoalesced.
+    for query, originals in coalescer.coalesce(iid_cache.rewrite(queries)):
+        merged_match = len(originals) > 1 and query.startswith("match")
+        answer_count = iid_cache.insert(transaction, query, captured, count_answers=merged_match)
+
+        if merged_match and answer_count == 0:
+            for original in originals:
+                iid_cache.insert(transaction, original, captured)
+
+
+def _load_batch(
+    session: TypeDBSession,
+    batch: list[str],
+    retry_policy: RetryPolicy,
+    metrics: LoadMetrics,
+    coalescer: QueryCoalescer,
+    iid_cache: IIDCache,
+    attempt: int = 1,
+) -> bool:
+    while True:
+        committing = False
+
+        try:
+            start = time.perf_counter()
+
+            with session.transaction(TransactionType.WRITE) as transaction:
+                opened = time.perf_counter()
+                captured: list[tuple[int, str]] = list()
+
+                _insert_queries(transaction, batch, coalescer, iid_cache, captured)
+
+                inserted = time.perf_counter()
+                committing = True
+                transaction.commit()
+                committed = time.perf_counter()
+
+            iid_cache.record(captured)
+
+            metrics.record("open", opened - start)
+            metrics.record("insert", inserted - opened)
+            metrics.record("commit", committed - inserted)
+            metrics.record_commit(len(batch))
+            return True
+        except TypeDBDriverException:
+            if committing:
+                metrics.count("commit_failures")
+
+            if attempt >= retry_policy.maximum_attempts:
+                return False
+
+            metrics.count("retries")
+            retry_policy.backoff(attempt)
+            attempt += 1
+
+
+def _merge_by_address(address_metrics: dict[str, LoadMetrics], addresses: str | list[str], metrics: LoadMetrics) -> None:
+    address_metrics.setdefault(AddressSelector.label(addresses), LoadMetrics()).merge(metrics)
+
 
 class BulkLoader(ABC):
-    def __init__(self, file_paths: str | list[str], batch_size: int, transaction_count: int, config: Config):
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
         if type(file_paths) is str:
             self.file_paths = [file_paths]
         else:
@@ -20,60 +119,291 @@ class BulkLoader(ABC):
 
         self.batch_size = batch_size
         self.transaction_count = transaction_count
+        self.coalescing_factor = coalescing_factor
         self.config = config
+        self.resources = resources
+        self.checkpoint = checkpoint
         self.queries_run = 0
+        self.dead_letters: list[list[str]] = list()
+        self.metrics = LoadMetrics()
+        self.worker_metrics: list[LoadMetrics] = list()
+        self._stopping = threading.Event()
+        self.query_budget: int | None = None
+        self.budget_exhausted = False
+        self.address_metrics: dict[str, LoadMetrics] = dict()
+        self.queues: list = list()
+        self._retry_policy = self.config.retry_policy
+        self._coalescer = QueryCoalescer(self.coalescing_factor, self.config.coalescing_key_attributes)
+        self._iid_cache = init_iid_cache(self.config)
 
     @property
     @abstractmethod
     def loader_type(self) -> LoaderType:
         ...
 
+    @property
+    def process_count(self) -> int:
+        return 1
+
+    @property
+    def thread_count(self) -> int:
+        return 1
+
+    @property
+    def query_count(self) -> int:
+        return sum(row_count(path) for path in self.file_paths)
+
+    def _pending(self, path: str) -> list[tuple[int, int]]:
+        if self.checkpoint is None:
+            return [(0, row_count(path))]
+        else:
+            return self.checkpoint.pending(path, row_count(path))
+
+    def _file_lines(self, path: str) -> Iterator[tuple[int, str]]:
+        if is_columnar(path):
+            dataset = ColumnarDataset.open(path)
+
+            for rows in columnar_batches(path, self._pending(path), _render_chunk_size):
+                yield from enumerate(dataset.render(rows.start, rows.count), rows.start)
+        elif self.checkpoint is None:
+            with open_data(path, "rt") as file:
+                yield from enumerate(file)
+        else:
+            index = LineIndex.open(path)
+
+            with open_data(path, "rb") as file:
+                for start, count in self.checkpoint.pending(path, len(index)):
+                    file.seek(index.offset(start))
+
+                    for line_number in range(start, start + count):
+                        yield line_number, file.readline().decode()
+
+    def _budget_left(self, sent: int) -> int | None:
+        # Budgets are per file and counted as queries are fed, so every configuration loads exactly its budget however
+        # fast it commits, rather than overshooting by whatever it committed between two samples of the journal.
+        if self.query_budget is None:
+            return None
+        elif sent >= self.query_budget:
+            self.budget_exhausted = True
+
+        return max(0, self.query_budget - sent)
+
+    def _feed(self, path: str, lines: Iterator[tuple[int, str]]) -> Iterator[tuple[str, int, str]]:
+        sent = 0
+
+        for line_number, query in lines:
+            if self._stopping.is_set() or self._budget_left(sent) == 0:
+                return
+
+            sent += 1
+            self.queries_run += 1
+            yield path, line_number, query
+
+    def _file_queries(self, path: str) -> Iterator[tuple[str, int, str]]:
+        if self.config.read_ahead_depth <= 0:
+            yield from self._feed(path, self._file_lines(path))
+            return
+
+        read_ahead = ReadAhead(self._file_lines(path), self.config.read_ahead_depth)
+
+        try:
+            yield from self._feed(path, read_ahead)
+        finally:
+            read_ahead.close()
+            self.metrics.merge(read_ahead.metrics)
+
+    def _queries(self) -> Iterator[tuple[str, int, str]]:
+        for path in self.file_paths:
+            yield from self._file_queries(path)
+
+    def _batches(self) -> Iterator[tuple[str, list[tuple[int, int, int]], list[str]]]:
+        # Batches hold contiguous lines of one file, so each committed batch is a single checkpoint range. Columnar
+        # batches are row references, rendered into queries only by the worker that sends them.
+        for path in self.file_paths:
+            if is_columnar(path):
+                sent = 0
+
+                for rows in columnar_batches(path, self._pending(path), self.batch_size):
+                    budget_left = self._budget_left(sent)
+
+                    if self._stopping.is_set() or budget_left == 0:
+                        break
+                    elif budget_left is not None and budget_left < rows.count:
+                        rows = ColumnarRows(path, rows.start, budget_left)
+
+                    sent += rows.count
+                    self.queries_run += len(rows)
+                    yield path, [(rows.start, rows.count, 1)], rows
+
+                continue
+
+            batch_start, next_batch = 0, list()
+
+            for _, line_number, query in self._file_queries(path):
+                if next_batch and line_number != batch_start + len(next_batch):
+                    yield path, [(batch_start, len(next_batch), 1)], next_batch
+                    next_batch: list[str] = list()
+
+                if not next_batch:
+                    batch_start = line_number
+
+                next_batch.append(query)
+
+                if len(next_batch) >= self.batch_size:
+                    yield path, [(batch_start, len(next_batch), 1)], next_batch
+                    next_batch: list[str] = list()
+
+            if next_batch:
+                yield path, [(batch_start, len(next_batch), 1)], next_batch
+
+    def setup(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        # Stops feeding new queries, while everything already read is still committed before load returns.
+        self._stopping.set()
+
     @abstractmethod
     def load(self) -> None:
         ...
 
 
+class _CarouselTransaction:
+    def __init__(self, transaction: TypeDBTransaction, session: TypeDBSession, addresses: str | list[str]):
+        self.transaction = transaction
+        self.session = session
+        self.addresses = addresses
+        self.metrics = LoadMetrics()
+        self.batch: list[str] = list()
+        self.lines: list[tuple[str, int]] = list()
+        self.uncoalesced: list[str] = list()
+        self.captured: list[tuple[int, str]] = list()
+        self.insert_time = 0.0
+
+
 class CarouselBulkLoader(BulkLoader):
-    def __init__(self, file_paths: str | list[str], batch_size: int, transaction_count: int, config: Config):
-        super().__init__(file_paths, batch_size, transaction_count, config)
-        self._driver = self.config.driver_type.init(self.config.addresses, self.config.username, self.config.password)
-        self._session = self._driver.session(self.config.database, SessionType.DATA)
-        self._transactions: deque[TypeDBTransaction] = deque()
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self._transactions: deque[_CarouselTransaction] = deque()
         self._uncommitted_queries = 0
         self._open_transactions()
 
     def __del__(self):
         while self._transactions:
             try:
-                self._transactions.pop().close()
+                self._transactions.pop().transaction.close()
             except TypeDBDriverException:
                 continue
-        
-        try:
-            self._session.close()
-        except TypeDBDriverException:
-            pass
-        finally:
-            self._driver.close()
 
     @property
     def loader_type(self) -> LoaderType:
         return LoaderType.CAROUSEL
 
-    def _queries(self) -> Iterator[str]:
-        for path in self.file_paths:
-            with open(path, "r") as file:
-                for line in file:
-                    self.queries_run += 1
-                    yield line
+    def _open_transaction(self) -> _CarouselTransaction:
+        addresses = self.resources.addresses.next()
+        session = self.resources.session_for(addresses)
+        start = time.perf_counter()
+        carousel_transaction = _CarouselTransaction(session.transaction(TransactionType.WRITE), session, addresses)
+        carousel_transaction.metrics.record("open", time.perf_counter() - start)
+        return carousel_transaction
 
     def _open_transactions(self) -> None:
         for _ in range(self.transaction_count):
-            self._transactions.append(self._session.transaction(TransactionType.WRITE))
+            self._transactions.append(self._open_transaction())
+
+    def _record(self, lines: list[tuple[str, int]], dead: bool = False) -> None:
+        if self.checkpoint is None:
+            return
+
+        for path in dict.fromkeys(path for path, _ in lines):
+            self.checkpoint.record(path, Checkpoint.runs([line for line_path, line in lines if line_path == path]), dead)
+
+    def _record_captured(self, captured: list[tuple[int, str]]) -> None:
+        self._iid_cache.record(captured)
+
+    def _dead_letter(self, carousel_transaction: _CarouselTransaction) -> None:
+        self.dead_letters.append(carousel_transaction.batch)
+        self._record(carousel_transaction.lines, dead=True)
+
+    def _retry(self, carousel_transaction: _CarouselTransaction) -> None:
+        # Retries stay on the failed transaction's address, so its failures and latencies are attributed to that node.
+        # The failed commit was the first attempt, so a policy allowing only one goes straight to the dead letters.
+        if self._retry_policy.maximum_attempts < 2:
+            self._dead_letter(carousel_transaction)
+            return
+
+        metrics = carousel_transaction.metrics
+        metrics.count("retries")
+        self._retry_policy.backoff(1)
+
+        if _load_batch(carousel_transaction.session, carousel_transaction.batch, self._retry_policy, metrics, self._coalescer, self._iid_cache, attempt=2):
+            self._record(carousel_transaction.lines)
+        else:
+            self._dead_letter(carousel_transaction)
+
+    @staticmethod
+    def _merge(
+        carousel_transaction: _CarouselTransaction,
+        metrics: LoadMetrics,
+        address_metrics: dict[str, LoadMetrics],
+    ) -> None:
+        metrics.merge(carousel_transaction.metrics)
+        _merge_by_address(address_metrics, carousel_transaction.addresses, carousel_transaction.metrics)
+
+    def _send(self, carousel_transaction: _CarouselTransaction) -> None:
+        start = time.perf_counter()
+
+        _insert_queries(
+            carousel_transaction.transaction,
+            carousel_transaction.uncoalesced,
+            self._coalescer,
+            self._iid_cache,
+            carousel_transaction.captured,
+        )
+
+        carousel_transaction.insert_time += time.perf_counter() - start
+        carousel_transaction.uncoalesced.clear()
+
+    def _commit_transactions(
+        self,
+        transactions: deque[_CarouselTransaction],
+        metrics: LoadMetrics,
+        address_metrics: dict[str, LoadMetrics],
+    ) -> None:
+        while transactions:
+            carousel_transaction = transactions.popleft()
+            transaction_metrics = carousel_transaction.metrics
+            committing = False
+
+            try:
+                self._send(carousel_transaction)
+                start = time.perf_counter()
+                committing = True
+                carousel_transaction.transaction.commit()
+                transaction_metrics.record("commit", time.perf_counter() - start)
+                transaction_metrics.record("insert", carousel_transaction.insert_time)
+                transaction_metrics.record_commit(len(carousel_transaction.batch))
+                self._record(carousel_transaction.lines)
+                self._record_captured(carousel_transaction.captured)
+            except TypeDBDriverException:
+                if committing:
+                    transaction_metrics.count("commit_failures")
+
+                self._retry(carousel_transaction)
+
+            self._merge(carousel_transaction, metrics, address_metrics)
 
     def _commit(self) -> None:
-        while self._transactions:
-            self._transactions.popleft().commit()
+        self._commit_transactions(self._transactions, self.metrics, self.address_metrics)
 
     def _refresh_transactions_if_batches_full(self) -> None:
         if self.batch_size is None:
@@ -83,16 +413,33 @@ class CarouselBulkLoader(BulkLoader):
             self._uncommitted_queries = 0
             self._open_transactions()
 
-    def _insert(self, query: str) -> None:
-        transaction = self._transactions.popleft()
-        transaction.query.insert(query)
-        self._transactions.append(transaction)
+    def _insert(self, path: str, line_number: int, query: str) -> None:
+        carousel_transaction = self._transactions.popleft()
+        carousel_transaction.batch.append(query)
+        carousel_transaction.lines.append((path, line_number))
+        carousel_transaction.uncoalesced.append(query)
+
+        try:
+            if len(carousel_transaction.uncoalesced) >= self.coalescing_factor:
+                self._send(carousel_transaction)
+        except TypeDBDriverException:
+            # The failed transaction is replaced so the carousel keeps its width, and its batch is retried alone.
+            try:
+                carousel_transaction.transaction.close()
+            except TypeDBDriverException:
+                pass
+
+            self._retry(carousel_transaction)
+            self._merge(carousel_transaction, self.metrics, self.address_metrics)
+            carousel_transaction = self._open_transaction()
+
+        self._transactions.append(carousel_transaction)
         self._uncommitted_queries += 1
         self._refresh_transactions_if_batches_full()
 
     def load(self) -> None:
-        for query in self._queries():
-            self._insert(query)
+        for path, line_number, query in self._queries():
+            self._insert(path, line_number, query)
 
         self._commit()
 
@@ -100,77 +447,886 @@ class CarouselBulkLoader(BulkLoader):
 class PoolBulkLoader(BulkLoader):
     _queue_length_factor = 4
 
-    def __init__(self, file_paths: str | list[str], batch_size: int, transaction_count: int, config: Config):
-        super().__init__(file_paths, batch_size, transaction_count, config)
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self._key_pattern = re.compile(rf"""has\s+{re.escape(self.config.partitioning_key_attribute)}\s+([^;\s]+)\s*;""")
+        self._popularity: dict[str, int] = dict()
 
     @property
     def loader_type(self) -> LoaderType:
         return LoaderType.POOL
 
-    def _queries(self) -> Iterator[str]:
+    @property
+    def process_count(self) -> int:
+        return self.transaction_count
+
+    def setup(self) -> None:
+        self.resources.pool(self.process_count)
+
+        # Keys are counted over everything left to load before timing starts, so each query's owner is fixed by the
+        # whole file rather than by whichever queries happened to come before it.
+        if self.loader_type is LoaderType.POOL and self.config.partitioning_mode is PartitioningMode.HASHED:
+            for path in self.file_paths:
+                for _, query in self._file_lines(path):
+                    for key in self._key_pattern.findall(query):
+                        self._popularity[key] = self._popularity.get(key, 0) + 1
+
+    def _route(self, keys: list[str]) -> int | None:
+        if not keys:
+            return None
+
+        # Queries go to the worker owning their most popular key, with ties broken by key, so every query containing
+        # the hottest key goes to one worker. Other keys are written by more than one worker only where they share a
+        # query with a more popular key.
+        owner = max(keys, key=lambda key: (self._popularity.get(key, 0), key))
+        return zlib.crc32(owner.encode()) % self.transaction_count
+
+    def _routed_batches(self) -> Iterator[tuple[int, tuple[str, list[tuple[int, int, int]], list[str]]]]:
+        pending: list[tuple[str | None, list[int], list[str]]] = [(None, list(), list()) for _ in range(self.transaction_count)]
+        next_worker = 0
+
+        for path, line_number, query in self._queries():
+            worker = self._route(self._key_pattern.findall(query))
+
+            if worker is None:
+                worker = next_worker
+                next_worker = (next_worker + 1) % self.transaction_count
+
+            batch_path, lines, batch = pending[worker]
+
+            if batch and path != batch_path:
+                yield worker, (batch_path, Checkpoint.runs(lines), batch)
+                lines, batch = list(), list()
+
+            lines.append(line_number)
+            batch.append(query)
+            pending[worker] = (path, lines, batch)
+
+            if len(batch) >= self.batch_size:
+                yield worker, (path, Checkpoint.runs(lines), batch)
+                pending[worker] = (None, list(), list())
+
+        for worker, (batch_path, lines, batch) in enumerate(pending):
+            if batch:
+                yield worker, (batch_path, Checkpoint.runs(lines), batch)
+
+    @staticmethod
+    def _batch_loader(
+        queue: Queue,
+        driver_type: DriverType,
+        addresses: str | list[str],
+        username: str,
+        password: str,
+        simulation: SimulationModel,
+        database: str,
+        epoch: int,
+        retry_policy: RetryPolicy,
+        coalescer: QueryCoalescer,
+        iid_cache: IIDCache,
+        checkpoint: Checkpoint | None,
+    ) -> tuple[list[list[str]], LoadMetrics]:
+        dead_letters: list[list[str]] = list()
+        metrics = LoadMetrics()
+
+        session = worker_session(driver_type, addresses, username, password, simulation, database, epoch)
+
+        while True:
+            item: tuple[str, list[tuple[int, int, int]], list[str]] | None = queue.get()
+
+            if item is None:
+                break
+
+            path, runs, batch = item
+            loaded = _load_batch(session, batch, retry_policy, metrics, coalescer, iid_cache)
+
+            if not loaded:
+                dead_letters.append(batch)
+
+            if checkpoint is not None and batch:
+                checkpoint.record(path, runs, dead=not loaded)
+
+        return dead_letters, metrics
+
+    def _put(self, queue: Queue, item, results: list[AsyncResult]) -> None:
+        # Blocking forever on a full queue would hang the load if the workers have died, so failures are re-raised.
+        start = time.perf_counter()
+
+        while True:
+            try:
+                queue.put(item, timeout=1)
+                self.metrics.record("queue_wait", time.perf_counter() - start)
+                return
+            except queues.Full:
+                for result in results:
+                    if result.ready() and not result.successful():
+                        result.get()
+
+    def _abort(self, worker_queues: list) -> None:
+        # Surviving workers blocked on their queues are sent a sentinel where there is room, and the pool is replaced
+        # regardless, as a worker that failed or is stuck mid-batch would otherwise hold every later barrier short.
+        for worker_queue in worker_queues:
+            try:
+                worker_queue.put_nowait(None)
+            except (queues.Full, EOFError, OSError):
+                continue
+
+        self.resources.terminate_pool()
+
+    def load(self) -> None:
+        manager = self.resources.manager
+        pool = self.resources.pool(self.transaction_count)
+
+        kwargs = {
+            **self.resources.connection(),
+            "retry_policy": self._retry_policy,
+            "coalescer": self._coalescer,
+            "iid_cache": self._iid_cache,
+            "checkpoint": self.checkpoint,
+        }
+
+        match self.config.partitioning_mode:
+            case PartitioningMode.ROUND_ROBIN:
+                queue = manager.Queue(self._queue_length_factor * self.transaction_count)
+                worker_queues = [queue] * self.transaction_count
+                routed_batches = ((0, batch) for batch in self._batches())
+            case PartitioningMode.HASHED:
+                worker_queues = [manager.Queue(self._queue_length_factor) for _ in range(self.transaction_count)]
+                routed_batches = self._routed_batches()
+
+        self.queues = worker_queues[:1] if self.config.partitioning_mode is PartitioningMode.ROUND_ROBIN else worker_queues
+
+        assigned_addresses = self.resources.addresses.assign(self.transaction_count)
+        results = [
+            pool.apply_async(self._batch_loader, kwds={**kwargs, "queue": worker_queue, "addresses": addresses})
+            for worker_queue, addresses in zip(worker_queues, assigned_addresses)
+        ]
+
+        try:
+            for worker, batch in routed_batches:
+                self._put(worker_queues[worker], batch, results)
+
+            for worker_queue in worker_queues:
+                self._put(worker_queue, None, results)
+
+            for result, addresses in zip(results, assigned_addresses):
+                dead_letters, metrics = result.get()
+                self.dead_letters.extend(dead_letters)
+                self.metrics.merge(metrics)
+                self.worker_metrics.append(metrics)
+                _merge_by_address(self.address_metrics, addresses, metrics)
+        except BaseException:
+            self._abort(worker_queues)
+            raise
+
+
+class ShardedPoolBulkLoader(PoolBulkLoader):
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.SHARDED_POOL
+
+    def setup(self) -> None:
+        # Shards of a compressed file could only seek through its decompressed stream from the start, and files are
+        # recognised by suffix, so this is checked per file rather than by the compression setting alone.
+        for path in self.file_paths:
+            if is_compressed(path):
+                raise ValueError(f"The sharded_pool loader type does not support compressed input: {path}")
+
+        super().setup()
+
+    def _shards(self) -> Iterator[tuple[str, int, int, int]]:
+        shard_count = self._queue_length_factor * self.transaction_count
+
         for path in self.file_paths:
-            with open(path, "r") as file:
-                for line in file:
-                    self.queries_run += 1
-                    yield line
+            sent = 0
+
+            if is_columnar(path):
+                shards = ((0, start_line, line_count) for start_line, line_count in split_ranges(self._pending(path), shard_count))
+            else:
+                index = LineIndex.open(path)
+                ranges = None if self.checkpoint is None else self.checkpoint.pending(path, len(index))
+                shards = ((index.offset(start_line), start_line, line_count) for start_line, line_count in index.shards(shard_count, ranges))
+
+            # The shard that reaches a query budget is cut short, so sharded loads feed exactly the budget too.
+            for offset, start_line, line_count in shards:
+                budget_left = self._budget_left(sent)
+
+                if self._stopping.is_set():
+                    return
+                elif budget_left == 0:
+                    break
+                elif budget_left is not None:
+                    line_count = min(line_count, budget_left)
+
+                sent += line_count
+                yield path, offset, start_line, line_count
+
+    @staticmethod
+    def _shard_queries(path: str, offset: int, start_line: int, line_count: int) -> Iterator[str]:
+        if is_columnar(path):
+            for rows in columnar_batches(path, [(start_line, line_count)], _render_chunk_size):
+                yield from rows
 
-    def _batches(self) -> Iterator[list[str]]:
+            return
+
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                position = offset
+
+                for _ in range(line_count):
+                    line_end = data.find(b"\n", position)
+
+                    if line_end == -1:
+                        line_end = len(data) - 1
+
+                    yield data[position:line_end + 1].decode()
+                    position = line_end + 1
+
+    @staticmethod
+    def _shard_batches(queries: Iterator[str], start_line: int, batch_size: int) -> Iterator[tuple[int, list[str]]]:
         next_batch: list[str] = list()
 
-        for query in self._queries():
+        for query in queries:
             next_batch.append(query)
 
-            if len(next_batch) >= self.batch_size:
-                yield next_batch
+            if len(next_batch) >= batch_size:
+                yield start_line, next_batch
+                start_line += len(next_batch)
                 next_batch: list[str] = list()
 
-        yield next_batch
+        if next_batch:
+            yield start_line, next_batch
 
     @staticmethod
-    def _batch_loader(
+    def _shard_loader(
         queue: Queue,
         driver_type: DriverType,
         addresses: str | list[str],
         username: str,
         password: str,
+        simulation: SimulationModel,
         database: str,
-    ) -> None:
-        with driver_type.init(addresses, username, password) as driver:
-            with driver.session(database, SessionType.DATA) as session:
-                while True:
-                    batch: list[str] | None = queue.get()
+        epoch: int,
+        retry_policy: RetryPolicy,
+        coalescer: QueryCoalescer,
+        iid_cache: IIDCache,
+        checkpoint: Checkpoint | None,
+        batch_size: int,
+    ) -> tuple[int, list[list[str]], LoadMetrics]:
+        queries_run = 0
+        dead_letters: list[list[str]] = list()
+        metrics = LoadMetrics()
 
-                    if batch is None:
-                        break
-                    else:
-                        with session.transaction(TransactionType.WRITE) as transaction:
-                            for query in batch:
-                                transaction.query.insert(query)
+        session = worker_session(driver_type, addresses, username, password, simulation, database, epoch)
 
-                            transaction.commit()
+        while True:
+            shard: tuple[str, int, int, int] | None = queue.get()
+
+            if shard is None:
+                break
+
+            path, offset, start_line, line_count = shard
+            queries = ShardedPoolBulkLoader._shard_queries(path, offset, start_line, line_count)
+
+            for start, batch in ShardedPoolBulkLoader._shard_batches(queries, start_line, batch_size):
+                loaded = _load_batch(session, batch, retry_policy, metrics, coalescer, iid_cache)
+
+                if not loaded:
+                    dead_letters.append(batch)
+
+                if checkpoint is not None:
+                    checkpoint.record(path, [(start, len(batch), 1)], dead=not loaded)
+
+                queries_run += len(batch)
+
+        return queries_run, dead_letters, metrics
 
     def load(self) -> None:
-        with Manager() as manager:
-            pool = Pool(self.transaction_count)
-            queue = manager.Queue(self._queue_length_factor * self.transaction_count)
-
-            kwargs = {
-                "queue": queue,
-                "driver_type": self.config.driver_type,
-                "addresses": self.config.addresses,
-                "username": self.config.username,
-                "password": self.config.password,
-                "database": self.config.database,
-            }
+        manager = self.resources.manager
+        pool = self.resources.pool(self.transaction_count)
+        queue = manager.Queue(self._queue_length_factor * self.transaction_count)
+        self.queues = [queue]
+
+        kwargs = {
+            "queue": queue,
+            **self.resources.connection(),
+            "retry_policy": self._retry_policy,
+            "coalescer": self._coalescer,
+            "iid_cache": self._iid_cache,
+            "checkpoint": self.checkpoint,
+            "batch_size": self.batch_size,
+        }
+
+        assigned_addresses = self.resources.addresses.assign(self.transaction_count)
+        results = [
+            pool.apply_async(self._shard_loader, kwds={**kwargs, "addresses": addresses})
+            for addresses in assigned_addresses
+        ]
+
+        try:
+            for shard in self._shards():
+                self._put(queue, shard, results)
 
             for _ in range(self.transaction_count):
-                pool.apply_async(self._batch_loader, kwds=kwargs)
+                self._put(queue, None, results)
+
+            for result, addresses in zip(results, assigned_addresses):
+                queries_run, dead_letters, metrics = result.get()
+                self.queries_run += queries_run
+                self.dead_letters.extend(dead_letters)
+                self.metrics.merge(metrics)
+                self.worker_metrics.append(metrics)
+                _merge_by_address(self.address_metrics, addresses, metrics)
+        except BaseException:
+            self._abort([queue] * self.transaction_count)
+            raise
+
+
+class AdaptiveBulkLoader(CarouselBulkLoader):
+    _step_factor = 1.5
+    _failure_threshold = 0.1
+
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self.trajectory: list[dict] = list()
+        self._limits = {
+            "batch_size": self.config.adaptive_maximum_batch_size,
+            "transaction_count": self.config.adaptive_maximum_transaction_count,
+        }
+        self._directions = {"batch_size": 1, "transaction_count": 1}
+        self._parameter = "transaction_count"
+        self._previous_rate: float | None = None
+        self._generation_failures = 0
+        self._generation_start = time.time()
+
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.ADAPTIVE
+
+    def _retry(self, carousel_transaction: _CarouselTransaction) -> None:
+        self._generation_failures += 1
+        super()._retry(carousel_transaction)
+
+    def _step(self, parameter: str) -> None:
+        value = getattr(self, parameter)
+
+        # Steps are at least one, so small values still move, e.g. a single transaction steps up to two.
+        if self._directions[parameter] > 0:
+            new_value = min(self._limits[parameter], max(value + 1, int(value * self._step_factor)))
+        else:
+            new_value = max(1, min(value - 1, int(value / self._step_factor)))
 
+        if new_value == value:
+            self._directions[parameter] *= -1
+
+        setattr(self, parameter, new_value)
+
+    def _adapt(self, rate: float, failure_rate: float) -> None:
+        # Conflicts and timeouts above a threshold back off the current parameter in proportion to the fraction of
+        # transactions that failed, up to halving it, so a single conflict in a large generation is tolerated.
+        # Otherwise the controller hill-climbs one parameter at a time, turning back and switching parameter whenever
+        # the committed query rate falls.
+        if failure_rate > self._failure_threshold:
+            value = getattr(self, self._parameter)
+            setattr(self, self._parameter, max(1, min(value - 1, int(value * (1 - min(failure_rate, 1) / 2)))))
+            self._previous_rate = None
+            return
+
+        if self._previous_rate is not None and rate < self._previous_rate:
+            self._directions[self._parameter] *= -1
+            self._parameter = "batch_size" if self._parameter == "transaction_count" else "transaction_count"
+
+        self._previous_rate = rate
+        self._step(self._parameter)
+
+    def _refresh_transactions_if_batches_full(self) -> None:
+        if self._uncommitted_queries >= self.batch_size * self.transaction_count:
+            self._end_generation()
+            self._open_transactions()
+
+    def _end_generation(self) -> None:
+        transactions = len(self._transactions)
+        commit_start = time.time()
+        self._commit()
+        generation_end = time.time()
+        rate = self._uncommitted_queries / (generation_end - self._generation_start)
+
+        self.trajectory.append({
+            "batch_size": self.batch_size,
+            "transaction_count": self.transaction_count,
+            "queries": self._uncommitted_queries,
+            "rate": rate,
+            "commit_latency": (generation_end - commit_start) / max(1, transactions),
+            "failures": self._generation_failures,
+        })
+
+        # A generation that committed nothing, e.g. the empty one closing a load, says nothing about its parameters.
+        if self._uncommitted_queries > 0:
+            self._adapt(rate, self._generation_failures / max(1, transactions))
+
+        self._uncommitted_queries = 0
+        self._generation_failures = 0
+        self._generation_start = time.time()
+
+    def load(self) -> None:
+        for path, line_number, query in self._queries():
+            self._insert(path, line_number, query)
+
+        self._end_generation()
+
+
+class PipelinedCarouselBulkLoader(CarouselBulkLoader):
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self._executor = ThreadPoolExecutor(max_workers=self.config.pipeline_depth)
+        self._commits: deque[Future] = deque()
+        # Generations commit on background threads while the producer inserts and retries, so checkpoint records, IID
+        # captures and dead letters are appended under a lock, which is re-entrant as dead letters also record their
+        # lines. A retried batch's captures are appended by _load_batch itself, in the single append-mode write that
+        # already lets pool workers share the journal.
+        self._lock = threading.RLock()
+
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.PIPELINED_CAROUSEL
+
+    @property
+    def thread_count(self) -> int:
+        return 1 + self.config.pipeline_depth
+
+    def _record(self, lines: list[tuple[str, int]], dead: bool = False) -> None:
+        with self._lock:
+            super()._record(lines, dead)
+
+    def _record_captured(self, captured: list[tuple[int, str]]) -> None:
+        with self._lock:
+            super()._record_captured(captured)
+
+    def _dead_letter(self, carousel_transaction: _CarouselTransaction) -> None:
+        with self._lock:
+            super()._dead_letter(carousel_transaction)
+
+    def _commit_generation(self, transactions: deque[_CarouselTransaction]) -> tuple[LoadMetrics, dict[str, LoadMetrics]]:
+        # Each generation commits into its own metrics, which are merged by the producer as each generation is collected.
+        metrics = LoadMetrics()
+        address_metrics: dict[str, LoadMetrics] = dict()
+        self._commit_transactions(transactions, metrics, address_metrics)
+        return metrics, address_metrics
+
+    def _collect(self) -> None:
+        metrics, address_metrics = self._commits.popleft().result()
+        self.metrics.merge(metrics)
+
+        for address, single_address_metrics in address_metrics.items():
+            _merge_by_address(self.address_metrics, address, single_address_metrics)
+
+    def _commit(self) -> None:
+        while len(self._commits) >= self.config.pipeline_depth:
+            self._collect()
+
+        generation, self._transactions = self._transactions, deque()
+        self._commits.append(self._executor.submit(self._commit_generation, generation))
+
+    def load(self) -> None:
+        try:
+            super().load()
+
+            while self._commits:
+                self._collect()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncBulkLoader(BulkLoader):
+    _queue_length_factor = 4
+
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self._assigned_addresses = self.resources.addresses.assign(self.transaction_count)
+
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.ASYNC
+
+    @property
+    def thread_count(self) -> int:
+        return self.transaction_count
+
+    def setup(self) -> None:
+        for addresses in self._assigned_addresses:
+            self.resources.session_for(addresses)
+
+    async def _produce(self, queue: asyncio.Queue, reader: ThreadPoolExecutor) -> None:
+        # Batches are read on a dedicated thread, so file reads never stall the event loop.
+        loop = asyncio.get_running_loop()
+        batches = self._batches()
+
+        while (batch := await loop.run_in_executor(reader, next, batches, None)) is not None:
+            start = time.perf_counter()
+            await queue.put(batch)
+            self.metrics.record("queue_wait", time.perf_counter() - start)
+
+        for _ in range(self.transaction_count):
+            await queue.put(None)
+
+    async def _consume(
+        self,
+        queue: asyncio.Queue,
+        session: TypeDBSession,
+        executor: ThreadPoolExecutor,
+        metrics: LoadMetrics,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+
+        while (item := await queue.get()) is not None:
+            path, runs, batch = item
+            loaded = await loop.run_in_executor(
+                executor, _load_batch, session, batch, self._retry_policy, metrics, self._coalescer, self._iid_cache,
+            )
+
+            if not loaded:
+                self.dead_letters.append(batch)
+
+            if self.checkpoint is not None and batch:
+                self.checkpoint.record(path, runs, dead=not loaded)
+
+    async def _load(self) -> None:
+        queue = asyncio.Queue(self._queue_length_factor * self.transaction_count)
+        self.queues = [queue]
+        self.worker_metrics = [LoadMetrics() for _ in range(self.transaction_count)]
+        sessions = [self.resources.session_for(addresses) for addresses in self._assigned_addresses]
+
+        with ThreadPoolExecutor(max_workers=self.transaction_count) as executor:
+            with ThreadPoolExecutor(max_workers=1) as reader:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(self._produce(queue, reader))
+
+                    for session, metrics in zip(sessions, self.worker_metrics):
+                        group.create_task(self._consume(queue, session, executor, metrics))
+
+        for addresses, metrics in zip(self._assigned_addresses, self.worker_metrics):
+            self.metrics.merge(metrics)
+            _merge_by_address(self.address_metrics, addresses, metrics)
+
+    def load(self) -> None:
+        asyncio.run(self._load())
+
+
+class HybridPoolBulkLoader(PoolBulkLoader):
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.HYBRID_POOL
+
+    @property
+    def process_count(self) -> int:
+        return min(self.config.hybrid_process_count, self.transaction_count)
+
+    @property
+    def thread_counts(self) -> list[int]:
+        # Transactions are split exactly across processes, the first ones taking a thread more when they do not divide
+        # evenly, so the loader always runs transaction_count transactions, like every other loader.
+        base_count, extra_count = divmod(self.transaction_count, self.process_count)
+        return [base_count + (1 if process < extra_count else 0) for process in range(self.process_count)]
+
+    @property
+    def thread_count(self) -> int:
+        # Reported as the thread count of the largest process.
+        return max(self.thread_counts)
+
+    @staticmethod
+    def _thread_loader(
+        queue: Queue,
+        session: TypeDBSession,
+        retry_policy: RetryPolicy,
+        coalescer: QueryCoalescer,
+        iid_cache: IIDCache,
+        checkpoint: Checkpoint | None,
+        dead_letters: list[list[str]],
+        metrics: LoadMetrics,
+    ) -> None:
+        while True:
+            item: tuple[str, list[tuple[int, int, int]], list[str]] | None = queue.get()
+
+            if item is None:
+                break
+
+            path, runs, batch = item
+            loaded = _load_batch(session, batch, retry_policy, metrics, coalescer, iid_cache)
+
+            if not loaded:
+                dead_letters.append(batch)
+
+            if checkpoint is not None and batch:
+                checkpoint.record(path, runs, dead=not loaded)
+
+    @staticmethod
+    def _process_loader(
+        queue: Queue,
+        driver_type: DriverType,
+        addresses: str | list[str],
+        username: str,
+        password: str,
+        simulation: SimulationModel,
+        database: str,
+        epoch: int,
+        retry_policy: RetryPolicy,
+        coalescer: QueryCoalescer,
+        iid_cache: IIDCache,
+        checkpoint: Checkpoint | None,
+        thread_count: int,
+    ) -> tuple[list[list[str]], LoadMetrics]:
+        # All threads in a process share its driver and session, so connections scale with processes, not transactions.
+        dead_letters: list[list[str]] = list()
+        thread_metrics = [LoadMetrics() for _ in range(thread_count)]
+        errors: list[BaseException] = list()
+
+        def run(metrics: LoadMetrics) -> None:
+            try:
+                HybridPoolBulkLoader._thread_loader(
+                    queue, session, retry_policy, coalescer, iid_cache, checkpoint, dead_letters, metrics,
+                )
+            except BaseException as error:
+                errors.append(error)
+
+        session = worker_session(driver_type, addresses, username, password, simulation, database, epoch)
+
+        threads = [threading.Thread(target=run, args=(metrics,)) for metrics in thread_metrics]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        metrics = LoadMetrics()
+
+        for single_thread_metrics in thread_metrics:
+            metrics.merge(single_thread_metrics)
+
+        return dead_letters, metrics
+
+    def load(self) -> None:
+        manager = self.resources.manager
+        pool = self.resources.pool(self.process_count)
+        queue = manager.Queue(self._queue_length_factor * self.transaction_count)
+        self.queues = [queue]
+
+        kwargs = {
+            "queue": queue,
+            **self.resources.connection(),
+            "retry_policy": self._retry_policy,
+            "coalescer": self._coalescer,
+            "iid_cache": self._iid_cache,
+            "checkpoint": self.checkpoint,
+        }
+
+        assigned_addresses = self.resources.addresses.assign(self.process_count)
+        results = [
+            pool.apply_async(self._process_loader, kwds={**kwargs, "addresses": addresses, "thread_count": thread_count})
+            for addresses, thread_count in zip(assigned_addresses, self.thread_counts)
+        ]
+
+        try:
             for batch in self._batches():
-                queue.put(batch)
+                self._put(queue, batch, results)
 
             for _ in range(self.transaction_count):
-                queue.put(None)
+                self._put(queue, None, results)
+
+            for result, addresses in zip(results, assigned_addresses):
+                dead_letters, metrics = result.get()
+                self.dead_letters.extend(dead_letters)
+                self.metrics.merge(metrics)
+                self.worker_metrics.append(metrics)
+                _merge_by_address(self.address_metrics, addresses, metrics)
+        except BaseException:
+            self._abort([queue] * self.transaction_count)
+            raise
+
+
+class ExternalBulkLoader(BulkLoader):
+    # Drives a loader written against another language's driver as a child process. The child connects during setup and
+    # then waits for a start signal, so the timed load excludes runtime startup just as it excludes Python setup.
+    #
+    # To check a harness by hand after changing it, build it (mvn -f java/pom.xml package, or npm install && npm run
+    # build in nodejs), run its configured command with --harness --files <file> against a server with the schema
+    # defined, and type "start" once it prints "ready". It should then print "result\t<file>\t<count>\t<seconds>" for
+    # each file and exit with code 0.
+    def __init__(
+        self,
+        file_paths: str | list[str],
+        batch_size: int,
+        transaction_count: int,
+        config: Config,
+        resources: LoaderResources,
+        checkpoint: Checkpoint = None,
+        coalescing_factor: int = 1,
+    ):
+        super().__init__(file_paths, batch_size, transaction_count, config, resources, checkpoint, coalescing_factor)
+        self._process: subprocess.Popen | None = None
+        self._output: list[str] = list()
+
+        if any(is_columnar(path) or is_compressed(path) for path in self.file_paths):
+            raise ValueError("External loaders only read uncompressed tql files.")
+        elif self.config.driver_type is DriverType.SIMULATED:
+            raise ValueError("External loaders do not support the simulated driver.")
+
+    @property
+    @abstractmethod
+    def command(self) -> list[str]:
+        ...
+
+    @property
+    def arguments(self) -> list[str]:
+        return [
+            "--harness",
+            "--driver", self.config.driver_type.value,
+            "--addresses", ",".join(self.config.addresses),
+            "--username", self.config.username,
+            "--database", self.config.database,
+            "--files", ",".join(self.file_paths),
+            "--batch-size", str(self.batch_size),
+            "--transaction-count", str(self.transaction_count),
+        ]
+
+    def _failure(self) -> RuntimeError:
+        output = "\n".join(self._output[-20:])
+        return RuntimeError(f"External {self.loader_type.value} loader exited with code {self._process.returncode}:\n{output}")
+
+    def _read_until(self, marker: str) -> str:
+        for line in self._process.stdout:
+            if line.startswith(marker):
+                return line.rstrip("\n")
+
+            self._output.append(line.rstrip("\n"))
+
+        self._process.wait()
+        raise self._failure()
+
+    def setup(self) -> None:
+        # The child loads whole files, so it cannot resume one that is partially committed.
+        for path in self.file_paths:
+            if self._pending(path) != [(0, row_count(path))]:
+                raise RuntimeError(f"External loaders cannot resume partially committed file: {path}")
+
+        environment = {**os.environ, "TYPEDB_PASSWORD": self.config.password or ""}
+
+        self._process = subprocess.Popen(
+            self.command + self.arguments,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=environment,
+        )
+
+        self._read_until("ready")
+
+    def load(self) -> None:
+        # Stopping early is not supported, as the child only reports once each file is fully loaded.
+        try:
+            self._process.stdin.write("start\n")
+            self._process.stdin.flush()
+
+            for _ in self.file_paths:
+                _, path, count, _ = self._read_until("result").split("\t")
+                self.queries_run += int(count)
 
-            pool.close()
-            pool.join()
+                if self.checkpoint is not None:
+                    self.checkpoint.record(path, [(0, int(count), 1)])
+
+            self._output.extend(line.rstrip("\n") for line in self._process.stdout)
+
+            if self._process.wait() != 0:
+                raise self._failure()
+        finally:
+            if self._process.poll() is None:
+                self._process.kill()
+
+            self._process.wait()
+
+
+class JavaPoolBulkLoader(ExternalBulkLoader):
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.JAVA_POOL
+
+    @property
+    def thread_count(self) -> int:
+        return self.transaction_count
+
+    @property
+    def command(self) -> list[str]:
+        return self.config.java_command
+
+
+class NodeAsyncBulkLoader(ExternalBulkLoader):
+    @property
+    def loader_type(self) -> LoaderType:
+        return LoaderType.NODE_ASYNC
+
+    @property
+    def command(self) -> list[str]:
+        return self.config.node_command
@@ -0,0 +1,125 @@
+import os
+
+
+class Checkpoint:
+    _separator = "\t"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def test_header(loader_type: str, batch_size: int, transaction_count: int, coalescing_factor: int, trial: int = 0) -> list[str]:
+        return [loader_type, str(batch_size), str(transaction_count), str(coalescing_factor), str(trial)]
+
+    @staticmethod
+    def runs(lines: list[int]) -> list[tuple[int, int, int]]:
+        # Compresses line numbers into (start, count, stride) runs, so strided carousel batches stay one record long.
+        runs: list[tuple[int, int, int]] = list()
+
+        for line in lines:
+            if runs:
+                start, count, stride = runs[-1]
+
+                if count == 1 and line > start:
+                    runs[-1] = (start, 2, line - start)
+                    continue
+                elif line == start + count * stride:
+                    runs[-1] = (start, count + 1, stride)
+                    continue
+
+            runs.append((line, 1, 1))
+
+        return runs
+
+    def _records(self) -> list[list[str]]:
+        try:
+            with open(self.path, "r") as journal:
+                return [line.rstrip("\n").split(self._separator) for line in journal if line.endswith("\n")]
+        except FileNotFoundError:
+            return list()
+
+    def _append(self, *fields: str) -> None:
+        # Each record is a single append-mode write, so pool workers can share the journal without locking.
+        entry = f"{self._separator.join(fields)}\n".encode()
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+
+        try:
+            os.write(descriptor, entry)
+        finally:
+            os.close(descriptor)
+
+    def reset(self, header: list[str]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path, "w") as journal:
+            journal.write(f"""{self._separator.join(["test"] + header)}\n""")
+
+    def header(self) -> list[str] | None:
+        for record in self._records():
+            if record[0] == "test":
+                return record[1:]
+
+        return None
+
+    def record(self, data_path: str, runs: list[tuple[int, int, int]], dead: bool = False) -> None:
+        # Dead-lettered lines are recorded apart from committed ones, so they are no longer pending but never count as
+        # committed progress.
+        record_type = "dead" if dead else "batch"
+        self._append(record_type, data_path, ",".join(f"{start}:{count}:{stride}" for start, count, stride in runs))
+
+    def committed(self, data_path: str, offset: int = 0) -> tuple[int, int]:
+        # Counts lines committed since a journal offset and returns the offset to continue from, so the journal can be
+        # tailed for progress while pool workers append to it from other processes.
+        try:
+            with open(self.path, "rb") as journal:
+                journal.seek(offset)
+                data = journal.read()
+        except FileNotFoundError:
+            return 0, offset
+
+        complete_length = data.rfind(b"\n") + 1
+        count = 0
+
+        for line in data[:complete_length].decode().splitlines():
+            record = line.split(self._separator)
+
+            if record[0] == "batch" and record[1] == data_path:
+                count += sum(int(run.split(":")[1]) for run in record[2].split(","))
+
+        return count, offset + complete_length
+
+    def dead_lettered(self, data_path: str) -> int:
+        return sum(
+            int(run.split(":")[1])
+            for record in self._records() if record[0] == "dead" and record[1] == data_path
+            for run in record[2].split(",")
+        )
+
+    def complete(self, data_path: str) -> None:
+        self._append("complete", data_path)
+
+    def is_complete(self, data_path: str) -> bool:
+        return any(record == ["complete", data_path] for record in self._records())
+
+    def pending(self, data_path: str, line_count: int) -> list[tuple[int, int]]:
+        committed = bytearray(line_count)
+
+        for record in self._records():
+            if record[0] in ("batch", "dead") and record[1] == data_path:
+                for run in record[2].split(","):
+                    start, count, stride = (int(value) for value in run.split(":"))
+                    committed[start:start + count * stride:stride] = b"\x01" * count
+
+        ranges: list[tuple[int, int]] = list()
+        start = committed.find(0)
+
+        while start != -1:
+            end = committed.find(1, start)
+
+            if end == -1:
+                end = line_count
+
+            ranges.append((start, end - start))
+            start = committed.find(0, end)
+
+        return ranges
@@ -0,0 +1,95 @@
+import re
+
+_token_pattern = re.compile(
+    r"""(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')"""
+    r"""|(?P<variable>\$[\w-]+)"""
+    r"""|(?P<keyword>\b(?:match|insert|delete|get|fetch|define|undefine|sort|offset|limit)\b)"""
+)
+
+_key_binding_pattern = re.compile(r"""\$([\w-]+)\s+has\s+([\w-]+)\s""")
+_iid_binding_pattern = re.compile(r"""\$([\w-]+)\s+iid\s""")
+
+
+class QueryCoalescer:
+    def __init__(self, factor: int, key_attributes: list[str]):
+        self.factor = factor
+        self.key_attributes = set(key_attributes)
+
+    def _parse(self, query: str) -> tuple[str, str, str] | None:
+        query = query.strip()
+        keywords = [match for match in _token_pattern.finditer(query) if match.lastgroup == "keyword"]
+        labels = [keyword.group() for keyword in keywords]
+
+        if labels == ["insert"] and keywords[0].start() == 0:
+            return "insert", "", query[keywords[0].end():].strip()
+        elif labels == ["match", "insert"] and keywords[0].start() == 0:
+            match_body = query[keywords[0].end():keywords[1].start()].strip()
+            insert_body = query[keywords[1].end():].strip()
+        else:
+            return None
+
+        # Merged match clauses form a cartesian product, so they are only safe when every variable is bound by a key or
+        # an IID, which makes each clause match at most one concept.
+        variables = {match.group()[1:] for match in _token_pattern.finditer(match_body) if match.lastgroup == "variable"}
+        keyed = {variable for variable, attribute in _key_binding_pattern.findall(match_body) if attribute in self.key_attributes}
+        keyed |= set(_iid_binding_pattern.findall(match_body))
+
+        if not variables <= keyed:
+            return None
+
+        return "match", match_body, insert_body
+
+    @staticmethod
+    def _rename(body: str, index: int) -> str:
+        def replace(match: re.Match) -> str:
+            if match.lastgroup == "variable":
+                return f"$q{index}_{match.group()[1:]}"
+            else:
+                return match.group()
+
+        return _token_pattern.sub(replace, body)
+
+    def _merge(self, kind: str, group: list[tuple[str, str, str]]) -> str:
+        insert_bodies = " ".join(self._rename(insert_body, index) for index, (_, _, insert_body) in enumerate(group))
+
+        if kind == "insert":
+            return f"insert {insert_bodies}"
+        else:
+            match_bodies = " ".join(self._rename(match_body, index) for index, (_, match_body, _) in enumerate(group))
+            return f"match {match_bodies} insert {insert_bodies}"
+
+    def coalesce(self, queries: list[str]) -> list[tuple[str, list[str]]]:
+        # Each coalesced query is returned with the queries it replaces, so a merged match that finds nothing can be
+        # replaced by its originals.
+        if self.factor <= 1:
+            return [(query, [query]) for query in queries]
+
+        coalesced: list[tuple[str, list[str]]] = list()
+        group: list[tuple[str, str, str]] = list()
+        group_queries: list[str] = list()
+
+        def flush() -> None:
+            if len(group) == 1:
+                coalesced.append((group_queries[0], list(group_queries)))
+            elif group:
+                coalesced.append((self._merge(group[0][0], group), list(group_queries)))
+
+            group.clear()
+            group_queries.clear()
+
+        for query in queries:
+            parsed = self._parse(query)
+
+            if parsed is None:
+                flush()
+                coalesced.append((query, [query]))
+                continue
+
+            if group and (parsed[0] != group[0][0] or len(group) >= self.factor):
+                flush()
+
+            group.append(parsed)
+            group_queries.append(query)
+
+        flush()
+        return coalesced
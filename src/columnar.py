@@ -0,0 +1,176 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from src.line_index import LineIndex
+
+_open_datasets: dict[str, "ColumnarDataset"] = dict()
+
+
+def is_columnar(path: str) -> bool:
+    return path.endswith(ColumnarDataset.suffix)
+
+
+def row_count(path: str) -> int:
+    if is_columnar(path):
+        return len(ColumnarDataset.open(path))
+    else:
+        return len(LineIndex.open(path))
+
+
+class ColumnarDataset:
+    # Each column is one contiguous fixed-width array after a JSON header holding the query template, so any row range
+    # can be rendered from a memory map without reading the rows around it.
+    suffix = ".tqlc"
+    _magic = b"TQLC"
+    _prefix_format = "<4sI"
+    _alignment = 8
+
+    def __init__(self, path: str, template: str, formats: list[str], offsets: list[int], row_count: int, data: mmap.mmap | None):
+        self.path = path
+        self.template = template
+        self.formats = formats
+        self._offsets = offsets
+        self._row_count = row_count
+        self._data = data
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    @staticmethod
+    def width(column_format: str) -> int:
+        return struct.calcsize(column_format)
+
+    @classmethod
+    def _layout(cls, template: str, formats: list[str], row_count: int) -> tuple[bytes, list[int], int]:
+        # Offsets are part of the header, so the header is sized with placeholder offsets of the same width first.
+        def header(offsets: list[int]) -> bytes:
+            fields = {"template": template, "formats": formats, "offsets": offsets, "row_count": row_count, "byteorder": sys.byteorder}
+            body = json.dumps(fields).encode()
+            prefix = struct.pack(cls._prefix_format, cls._magic, len(body))
+            return (prefix + body).ljust(-(-(len(prefix) + len(body)) // cls._alignment) * cls._alignment, b" ")
+
+        offsets = [2 ** 63 - 1] * len(formats)
+        position = len(header(offsets))
+
+        for column, column_format in enumerate(formats):
+            offsets[column] = position
+            position += -(-cls.width(column_format) * row_count // cls._alignment) * cls._alignment
+
+        return header(offsets).ljust(offsets[0] if offsets else 0, b" "), offsets, position
+
+    @classmethod
+    def encode(cls, formats: list[str], rows: list[tuple]) -> list[bytes]:
+        columns: list[bytes] = list()
+
+        for column, column_format in enumerate(formats):
+            if column_format == "q":
+                columns.append(array("q", [row[column] for row in rows]).tobytes())
+            else:
+                width = cls.width(column_format)
+                columns.append(b"".join(row[column].encode("ascii").ljust(width, b"\0") for row in rows))
+
+        return columns
+
+    @classmethod
+    def open(cls, path: str) -> "ColumnarDataset":
+        # Datasets are cached per process, so pool workers map each file once and reuse it for every batch.
+        if path not in _open_datasets:
+            with open(path, "rb") as file:
+                magic, header_length = struct.unpack(cls._prefix_format, file.read(struct.calcsize(cls._prefix_format)))
+
+                if magic != cls._magic:
+                    raise ValueError(f"Not a columnar dataset: {path}")
+
+                fields = json.loads(file.read(header_length))
+
+                if fields["byteorder"] != sys.byteorder:
+                    raise ValueError(f"Columnar dataset byte order does not match this machine: {path}")
+
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            _open_datasets[path] = cls(path, fields["template"], fields["formats"], fields["offsets"], fields["row_count"], data)
+
+        return _open_datasets[path]
+
+    def _column(self, column: int, start: int, count: int) -> list:
+        column_format = self.formats[column]
+        width = self.width(column_format)
+        offset = self._offsets[column] + start * width
+        block = self._data[offset:offset + count * width]
+
+        if column_format == "q":
+            return memoryview(block).cast("q").tolist()
+        else:
+            text = block.decode("ascii")
+            return [text[position:position + width].rstrip("\0") for position in range(0, len(text), width)]
+
+    def render(self, start: int, count: int) -> list[str]:
+        count = max(0, min(count, self._row_count - start))
+        columns = [self._column(column, start, count) for column in range(len(self.formats))]
+        return [self.template.format(*row) for row in zip(*columns)]
+
+
+class ColumnarWriter:
+    def __init__(self, path: str, template: str, formats: list[str], row_count: int):
+        self.path = path
+        self.formats = formats
+        header, offsets, self._size = ColumnarDataset._layout(template, formats, row_count)
+        self._positions = list(offsets)
+        self._file = open(path, "wb")
+        self._file.write(header)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, columns: list[bytes]) -> None:
+        for column, data in enumerate(columns):
+            self._file.seek(self._positions[column])
+            self._file.write(data)
+            self._positions[column] += len(data)
+
+    def write_rows(self, rows: list[tuple]) -> None:
+        self.write(ColumnarDataset.encode(self.formats, rows))
+
+    def close(self) -> None:
+        # The file is sized to the header layout, so padding after the last column is present however rows were written.
+        self._file.truncate(self._size)
+        self._file.close()
+
+
+class ColumnarRows:
+    # Rows pickle as a reference into the dataset, so queries are only rendered by the process that sends them.
+    def __init__(self, path: str, start: int, count: int):
+        self.path = path
+        self.start = start
+        self.count = count
+        self._queries: list[str] | None = None
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "start": self.start, "count": self.count, "_queries": None}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _rendered(self) -> list[str]:
+        if self._queries is None:
+            self._queries = ColumnarDataset.open(self.path).render(self.start, self.count)
+
+        return self._queries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rendered())
+
+    def __getitem__(self, item):
+        return self._rendered()[item]
+
+
+def columnar_batches(path: str, ranges: list[tuple[int, int]], batch_size: int) -> Iterator[ColumnarRows]:
+    for start, count in ranges:
+        for batch_start in range(start, start + count, batch_size):
+            yield ColumnarRows(path, batch_start, min(batch_size, start + count - batch_start))
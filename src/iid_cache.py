@@ -0,0 +1,195 @@
+import mmap
+import os
+import re
+import struct
+from src.utils import Config
+
+_open_caches: dict[str, tuple[tuple[int, int], mmap.mmap]] = dict()
+_insert_pattern = re.compile(r"\binsert\b")
+
+
+class IIDCache:
+    # Captures the IID of every entity inserted with an integer key, so later queries can match those entities by IID
+    # instead of by attribute. Workers append captures to a journal after each commit, and between files the journal
+    # is compacted into an array of fixed-width slots indexed by key, which every process maps read-only.
+    _magic = b"IIDC"
+    _header_format = "<4sII"
+    _record_format = "<qB"
+
+    def __init__(self, path: str, attribute: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._key_pattern = re.compile(rf"""\$([\w-]+)\s+has\s+{re.escape(attribute)}\s+(\d+)\s*;""")
+
+    @property
+    def journal_path(self) -> str:
+        return f"{self.path}.journal"
+
+    @property
+    def cache_path(self) -> str:
+        return f"{self.path}.iids"
+
+    def reset(self) -> None:
+        for path in (self.journal_path, self.cache_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+
+    def insert(self, transaction, query: str, captured: list[tuple[int, str]], count_answers: bool = False) -> int | None:
+        # Capturing or counting reads the insert's answer, which costs the round trip that the driver otherwise leaves
+        # in flight, so answers are only counted on request.
+        answers = transaction.query.insert(query)
+
+        if self.enabled and query.lstrip().startswith("insert"):
+            bindings = self._key_pattern.findall(query)
+        else:
+            bindings = list()
+
+        if not bindings and not count_answers:
+            return None
+
+        answer_count = 0
+
+        for answer in answers:
+            answer_count += 1
+
+            for variable, key in bindings:
+                captured.append((int(key), answer.get(variable).get_iid()))
+
+        return answer_count
+
+    def record(self, captured: list[tuple[int, str]]) -> None:
+        # Each batch is a single append-mode write, so pool workers can share the journal without locking.
+        if not captured:
+            return
+
+        entry = b"".join(
+            struct.pack(self._record_format, key, len(iid_bytes)) + iid_bytes
+            for key, iid_bytes in ((key, bytes.fromhex(iid[2:])) for key, iid in captured)
+        )
+
+        descriptor = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+
+        try:
+            os.write(descriptor, entry)
+        finally:
+            os.close(descriptor)
+
+    def compact(self) -> int:
+        if not self.enabled:
+            return 0
+
+        try:
+            with open(self.journal_path, "rb") as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            return 0
+
+        entries: dict[int, bytes] = dict()
+        record_size = struct.calcsize(self._record_format)
+        position = 0
+
+        # A torn final record can only come from an interrupted write, and is dropped along with its uncommitted IID.
+        while position + record_size <= len(data):
+            key, length = struct.unpack_from(self._record_format, data, position)
+            position += record_size
+
+            if position + length > len(data):
+                break
+
+            if key >= 0:
+                entries[key] = data[position:position + length]
+
+            position += length
+
+        if not entries:
+            return 0
+
+        width = max(len(iid_bytes) for iid_bytes in entries.values())
+        slot_count = max(entries) + 1
+        slots = bytearray((width + 1) * slot_count)
+
+        for key, iid_bytes in entries.items():
+            slot = key * (width + 1)
+            slots[slot] = len(iid_bytes)
+            slots[slot + 1:slot + 1 + len(iid_bytes)] = iid_bytes
+
+        # The cache is replaced rather than rewritten, so workers still mapping the old file never see a partial one.
+        temporary_path = f"{self.cache_path}.tmp"
+
+        with open(temporary_path, "wb") as cache:
+            cache.write(struct.pack(self._header_format, self._magic, width, slot_count))
+            cache.write(slots)
+
+        os.replace(temporary_path, self.cache_path)
+        return len(entries)
+
+    def _open(self) -> mmap.mmap | None:
+        # Caches are mapped once per process and remapped only when compaction has replaced the file.
+        try:
+            status = os.stat(self.cache_path)
+        except FileNotFoundError:
+            return None
+
+        identity = (status.st_ino, status.st_mtime_ns)
+        cached = _open_caches.get(self.cache_path)
+
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+
+        with open(self.cache_path, "rb") as cache:
+            data = mmap.mmap(cache.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, _, _ = struct.unpack_from(self._header_format, data)
+
+        if magic != self._magic:
+            raise ValueError(f"Not an IID cache: {self.cache_path}")
+
+        _open_caches[self.cache_path] = (identity, data)
+        return data
+
+    def _lookup(self, data: mmap.mmap, key: int) -> str | None:
+        _, width, slot_count = struct.unpack_from(self._header_format, data)
+
+        if not 0 <= key < slot_count:
+            return None
+
+        slot = struct.calcsize(self._header_format) + key * (width + 1)
+        length = data[slot]
+
+        if length == 0:
+            return None
+
+        return f"0x{data[slot + 1:slot + 1 + length].hex()}"
+
+    def rewrite(self, queries: list[str]) -> list[str]:
+        # Only match clauses are rewritten, and keys missing from the cache keep their attribute match.
+        if not self.enabled:
+            return queries
+
+        data = self._open()
+
+        if data is None:
+            return queries
+
+        def replace(match: re.Match) -> str:
+            iid = self._lookup(data, int(match.group(2)))
+            return match.group() if iid is None else f"${match.group(1)} iid {iid};"
+
+        rewritten: list[str] = list()
+
+        for query in queries:
+            insert = _insert_pattern.search(query)
+
+            if not query.lstrip().startswith("match") or insert is None:
+                rewritten.append(query)
+            else:
+                rewritten.append(self._key_pattern.sub(replace, query[:insert.start()]) + query[insert.start():])
+
+        return rewritten
+
+
+def init_iid_cache(config: Config) -> IIDCache:
+    path = f"{os.getcwd()}/{config.logs_dir}/{config.iid_cache_file}"
+    return IIDCache(path, config.iid_cache_attribute, config.iid_cache)
@@ -0,0 +1,93 @@
+import bz2
+import gzip
+import lzma
+import queue as queues
+import threading
+import time
+from collections.abc import Iterator
+from typing import IO
+from src.metrics import LoadMetrics
+
+_codecs = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+_buffer_size = 1 << 24
+
+
+def is_compressed(path: str) -> bool:
+    return any(path.endswith(suffix) for suffix in _codecs)
+
+
+def open_data(path: str, mode: str = "rb") -> IO:
+    for suffix, codec in _codecs.items():
+        if path.endswith(suffix):
+            return codec(path, mode)
+
+    return open(path, mode, buffering=_buffer_size)
+
+
+class ReadAhead:
+    # Lines are produced in chunks on a background thread into a bounded buffer, so decompression and disk reads
+    # overlap with database round trips without the reader running arbitrarily far ahead of the loader.
+    _chunk_size = 1024
+    _poll_interval = 0.1
+
+    def __init__(self, items: Iterator, depth: int):
+        self.metrics = LoadMetrics()
+        self._items = items
+        self._buffer = queues.Queue(depth)
+        self._stopped = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _put(self, chunk: list | None) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._buffer.put(chunk, timeout=self._poll_interval)
+                return True
+            except queues.Full:
+                continue
+
+        return False
+
+    def _read(self) -> None:
+        chunk: list = list()
+
+        try:
+            for item in self._items:
+                chunk.append(item)
+
+                if len(chunk) >= self._chunk_size:
+                    if not self._put(chunk):
+                        return
+
+                    chunk = list()
+
+            if chunk:
+                self._put(chunk)
+        except BaseException as error:
+            self._error = error
+        finally:
+            self._put(None)
+
+    def __iter__(self) -> Iterator:
+        while True:
+            try:
+                chunk = self._buffer.get_nowait()
+            except queues.Empty:
+                # Only waits on an empty buffer count as stalls, since those are time the loader could have been inserting.
+                start = time.perf_counter()
+                chunk = self._buffer.get()
+                self.metrics.count("input_stalls")
+                self.metrics.record("input_wait", time.perf_counter() - start)
+
+            if chunk is None:
+                break
+
+            yield from chunk
+
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join()
@@ -0,0 +1,100 @@
+import os
+import struct
+from array import array
+from src.inputs import open_data
+
+
+def split_ranges(ranges: list[tuple[int, int]], shard_count: int) -> list[tuple[int, int]]:
+    shard_size = max(1, -(-sum(count for _, count in ranges) // shard_count))
+    shards: list[tuple[int, int]] = list()
+
+    for start, count in ranges:
+        for shard_start in range(start, start + count, shard_size):
+            shards.append((shard_start, min(shard_size, start + count - shard_start)))
+
+    return shards
+
+
+class LineIndex:
+    suffix = ".idx"
+    _header_format = "<QQ"
+    _chunk_size = 1 << 24
+
+    def __init__(self, path: str, offsets: array):
+        self.path = path
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.path}{self.suffix}"
+
+    @staticmethod
+    def _file_stamp(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def build(cls, path: str) -> "LineIndex":
+        # Offsets hold the start of every line followed by the file size, so line i spans offsets[i]:offsets[i + 1].
+        # Offsets into compressed files are positions in the decompressed stream.
+        offsets = array("Q", [0])
+        position = 0
+
+        with open_data(path, "rb") as file:
+            while chunk := file.read(cls._chunk_size):
+                newline = chunk.find(b"\n")
+
+                while newline != -1:
+                    offsets.append(position + newline + 1)
+                    newline = chunk.find(b"\n", newline + 1)
+
+                position += len(chunk)
+
+        if offsets[-1] != position:
+            offsets.append(position)
+
+        index = cls(path, offsets)
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> "LineIndex":
+        index_path = f"{path}{cls.suffix}"
+
+        with open(index_path, "rb") as file:
+            header = file.read(struct.calcsize(cls._header_format))
+            offsets = array("Q")
+            offsets.frombytes(file.read())
+
+        if struct.unpack(cls._header_format, header) != cls._file_stamp(path):
+            raise ValueError(f"Line index is stale for data file: {path}")
+
+        return cls(path, offsets)
+
+    @classmethod
+    def open(cls, path: str) -> "LineIndex":
+        try:
+            return cls.load(path)
+        except (FileNotFoundError, ValueError, struct.error):
+            return cls.build(path)
+
+    def save(self) -> None:
+        with open(self.index_path, "wb") as file:
+            file.write(struct.pack(self._header_format, *self._file_stamp(self.path)))
+            self._offsets.tofile(file)
+
+    def offset(self, line: int) -> int:
+        return self._offsets[line]
+
+    def range(self, start_line: int, line_count: int) -> tuple[int, int]:
+        end_line = min(start_line + line_count, len(self))
+        return self._offsets[start_line], self._offsets[end_line]
+
+    def shards(self, shard_count: int, ranges: list[tuple[int, int]] = None) -> list[tuple[int, int]]:
+        if ranges is None:
+            ranges = [(0, len(self))]
+
+        return split_ranges(ranges, shard_count)
@@ -0,0 +1,129 @@
+import math
+import time
+
+
+class Histogram:
+    # Buckets grow geometrically from one microsecond, giving roughly 4% relative precision at any latency.
+    _minimum = 1e-6
+    _buckets_per_doubling = 16
+
+    def __init__(self):
+        self.counts: dict[int, int] = dict()
+        self.count = 0
+        self.maximum = 0.0
+
+    @classmethod
+    def _bucket(cls, value: float) -> int:
+        if value <= cls._minimum:
+            return 0
+        else:
+            return int(math.log2(value / cls._minimum) * cls._buckets_per_doubling) + 1
+
+    @classmethod
+    def _upper_bound(cls, bucket: int) -> float:
+        return cls._minimum * 2 ** (bucket / cls._buckets_per_doubling)
+
+    def record(self, value: float) -> None:
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "Histogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+        self.count += other.count
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, percentile: float) -> float:
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        cumulative_count = 0
+
+        for bucket in sorted(self.counts):
+            cumulative_count += self.counts[bucket]
+
+            if cumulative_count >= rank:
+                return min(self._upper_bound(bucket), self.maximum)
+
+        return self.maximum
+
+
+class LoadMetrics:
+    phases = ("open", "insert", "commit", "queue_wait", "input_wait")
+    percentiles = (50, 95, 99)
+    counters = ("commit_failures", "retries", "input_stalls")
+
+    def __init__(self):
+        self.histograms = {phase: Histogram() for phase in self.phases}
+        self.counts = {counter: 0 for counter in self.counters}
+        self.timeline: dict[int, int] = dict()
+
+    @classmethod
+    def columns(cls, prefix: str) -> list[str]:
+        columns: list[str] = list()
+
+        for phase in cls.phases:
+            columns += [f"{prefix}_{phase}_p{percentile}" for percentile in cls.percentiles]
+            columns.append(f"{prefix}_{phase}_max")
+
+        columns += [f"{prefix}_{counter}" for counter in cls.counters]
+        return columns
+
+    @classmethod
+    def address_columns(cls, prefix: str, address: str) -> list[str]:
+        return [f"{prefix}_{address}_committed"] + [f"{prefix}_{address}_commit_p{percentile}" for percentile in cls.percentiles]
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.histograms[phase].record(seconds)
+
+    def count(self, counter: str) -> None:
+        self.counts[counter] += 1
+
+    def record_commit(self, query_count: int) -> None:
+        second = int(time.time())
+        self.timeline[second] = self.timeline.get(second, 0) + query_count
+
+    def merge(self, other: "LoadMetrics") -> None:
+        for phase in self.phases:
+            self.histograms[phase].merge(other.histograms[phase])
+
+        for counter in self.counters:
+            self.counts[counter] += other.counts[counter]
+
+        for second, query_count in other.timeline.items():
+            self.timeline[second] = self.timeline.get(second, 0) + query_count
+
+    def summary(self, prefix: str) -> dict[str, float]:
+        summary: dict[str, float] = dict()
+
+        for phase in self.phases:
+            histogram = self.histograms[phase]
+
+            for percentile in self.percentiles:
+                summary[f"{prefix}_{phase}_p{percentile}"] = histogram.percentile(percentile)
+
+            summary[f"{prefix}_{phase}_max"] = histogram.maximum
+
+        for counter in self.counters:
+            summary[f"{prefix}_{counter}"] = self.counts[counter]
+
+        return summary
+
+    def address_summary(self, prefix: str, address: str) -> dict[str, float]:
+        summary: dict[str, float] = {f"{prefix}_{address}_committed": sum(self.timeline.values())}
+
+        for percentile in self.percentiles:
+            summary[f"{prefix}_{address}_commit_p{percentile}"] = self.histograms["commit"].percentile(percentile)
+
+        return summary
+
+    def committed_per_second(self, start: float) -> list[int]:
+        if not self.timeline:
+            return list()
+
+        first_second = int(start)
+        return [self.timeline.get(second, 0) for second in range(first_second, max(self.timeline) + 1)]
@@ -9,6 +9,15 @@ from functools import partial
 # https://stackoverflow.com/questions/77042910/join-on-multiprocessing-pool-deadlock-due-to-errno-61-connection-refused
 
 
+class CountingConnection(multiprocessing.connection.Connection):
+    # Counts bytes this process sends to the manager, so channel volume can be profiled without pickling items twice.
+    bytes_sent = 0
+
+    def _send_bytes(self, buf):
+        CountingConnection.bytes_sent += len(buf)
+        super()._send_bytes(buf)
+
+
 def _socket_client(address, reattempt_wait):
     family = multiprocessing.connection.address_type(address)
     with socket.socket(getattr(socket, family)) as s:
@@ -16,7 +25,7 @@ def _socket_client(address, reattempt_wait):
         while True:
             try:
                 s.connect(address)
-                return multiprocessing.connection.Connection(s.detach())
+                return CountingConnection(s.detach())
             except ConnectionRefusedError:
                 time.sleep(reattempt_wait)
 
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from src.mp_socket_client import CountingConnection
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_process(pid: int) -> tuple[float, int] | None:
+    # Returns cumulative CPU seconds and resident memory, from psutil where installed and otherwise from one read of
+    # /proc, so each sample costs a single small read per process.
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            cpu_times = process.cpu_times()
+            return cpu_times.user + cpu_times.system, process.memory_info().rss
+        except psutil.Error:
+            return None
+
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+
+    # Fields after the command name start at the third field of the man page, state.
+    return (int(fields[11]) + int(fields[12])) / _clock_ticks, int(fields[21]) * _page_size
+
+
+def available() -> bool:
+    return _read_process(os.getpid()) is not None
+
+
+class ResourceProfiler:
+    _trace_header = "loader_type,batch_size,transaction_count,coalescing_factor,trial,file,time,role,pid,cpu,rss,queue_depth,channel_bytes"
+
+    def __init__(
+        self,
+        interval: float,
+        trace_path: str,
+        test_key: str,
+        processes: Callable[[], dict[str, int]],
+        queues: Callable[[], list],
+    ):
+        self.interval = interval
+        self.trace_path = trace_path
+        self.test_key = test_key
+        self.cpu: dict[str, list[float]] = dict()
+        self.rss: dict[str, list[int]] = dict()
+        self.queue_depths: list[int] = list()
+        self.channel_bytes = 0
+        self._processes = processes
+        self._queues = queues
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @classmethod
+    def columns(cls, prefix: str) -> list[str]:
+        columns: list[str] = list()
+
+        for role in ("parent", "manager", "workers"):
+            columns += [f"{prefix}_{role}_cpu_mean", f"{prefix}_{role}_cpu_max", f"{prefix}_{role}_rss_max"]
+
+        return columns + [f"{prefix}_queue_depth_mean", f"{prefix}_queue_depth_max", f"{prefix}_channel_bytes"]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join()
+
+    def _queue_depth(self) -> int:
+        depth = 0
+
+        for queue in self._queues():
+            try:
+                depth += queue.qsize()
+            except (EOFError, OSError):
+                continue
+
+        return depth
+
+    def _run(self) -> None:
+        previous: dict[int, tuple[float, float]] = dict()
+        bytes_start = CountingConnection.bytes_sent
+        new_trace = not os.path.exists(self.trace_path)
+
+        with open(self.trace_path, "a") as trace:
+            if new_trace:
+                trace.write(f"{self._trace_header}\n")
+
+            while not self._closed.wait(self.interval):
+                now = time.time()
+                queue_depth = self._queue_depth()
+                self.queue_depths.append(queue_depth)
+                self.channel_bytes = CountingConnection.bytes_sent - bytes_start
+
+                for role, pid in self._processes().items():
+                    reading = _read_process(pid)
+
+                    if reading is None:
+                        continue
+
+                    cpu_seconds, rss = reading
+                    last = previous.get(pid)
+                    previous[pid] = (now, cpu_seconds)
+
+                    # CPU utilisation needs two readings, so a process first seen in this sample only sets a baseline.
+                    if last is None:
+                        continue
+
+                    cpu = (cpu_seconds - last[1]) / (now - last[0])
+                    group = "workers" if role.startswith("worker") else role
+                    self.cpu.setdefault(group, list()).append(cpu)
+                    self.rss.setdefault(group, list()).append(rss)
+                    trace.write(f"{self.test_key},{now},{role},{pid},{cpu},{rss},{queue_depth},{self.channel_bytes}\n")
+
+    def summary(self, prefix: str) -> dict[str, float]:
+        summary: dict[str, float] = dict()
+
+        for role in ("parent", "manager", "workers"):
+            cpu = self.cpu.get(role, [0.0])
+            summary[f"{prefix}_{role}_cpu_mean"] = sum(cpu) / len(cpu)
+            summary[f"{prefix}_{role}_cpu_max"] = max(cpu)
+            summary[f"{prefix}_{role}_rss_max"] = max(self.rss.get(role, [0]))
+
+        depths = self.queue_depths or [0]
+        summary[f"{prefix}_queue_depth_mean"] = sum(depths) / len(depths)
+        summary[f"{prefix}_queue_depth_max"] = max(depths)
+        summary[f"{prefix}_channel_bytes"] = self.channel_bytes
+        return summary
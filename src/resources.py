@@ -0,0 +1,230 @@
+import os
+from multiprocessing import Pool, Manager, TimeoutError
+from multiprocessing.managers import SyncManager
+from threading import Barrier, BrokenBarrierError
+from typedb.api.connection.driver import TypeDBDriver
+from typedb.api.connection.session import SessionType, TypeDBSession
+from typedb.common.exception import TypeDBDriverException
+from src.addresses import AddressSelector
+from src.metrics import LoadMetrics
+from src.simulation import SimulationModel
+from src.utils import AddressPolicy, Config, DriverType
+
+_worker_connection: dict[str, dict] = dict()
+_barrier_timeout = 60
+
+
+def _close_quietly(resource) -> None:
+    try:
+        resource.close()
+    except TypeDBDriverException:
+        pass
+
+
+def worker_session(
+    driver_type: DriverType,
+    addresses: str | list[str],
+    username: str,
+    password: str,
+    simulation: SimulationModel,
+    database: str,
+    epoch: int,
+) -> TypeDBSession:
+    # Pool processes outlive a single load, so each keeps a driver per address and only reopens its session when the
+    # epoch shows that the database has been recreated.
+    connection = _worker_connection.setdefault(AddressSelector.label(addresses), dict())
+
+    if "driver" not in connection:
+        connection["driver"] = driver_type.init(addresses, username, password, simulation)
+
+    if connection.get("epoch") != epoch:
+        if "session" in connection:
+            _close_quietly(connection.pop("session"))
+
+        connection["session"] = connection["driver"].session(database, SessionType.DATA)
+        connection["epoch"] = epoch
+
+    return connection["session"]
+
+
+def _warm_worker(barrier: Barrier, connections: list[dict]) -> None:
+    # The barrier holds every task until all have started, so each process in the pool receives exactly one.
+    for connection in connections:
+        worker_session(**connection)
+
+    barrier.wait()
+
+
+def _release_worker(barrier: Barrier, close_driver: bool) -> None:
+    for connection in _worker_connection.values():
+        if "session" in connection:
+            _close_quietly(connection.pop("session"))
+            connection.pop("epoch")
+
+        if close_driver and "driver" in connection:
+            connection.pop("driver").close()
+
+    if close_driver:
+        _worker_connection.clear()
+
+    barrier.wait()
+
+
+class LoaderResources:
+    def __init__(self, config: Config):
+        self.config = config
+        self.epoch = 0
+        self.addresses = AddressSelector(self.config.addresses, self.config.address_policy, self.config.address_weights)
+        self._drivers: dict[str, TypeDBDriver] = dict()
+        self._sessions: dict[str, TypeDBSession] = dict()
+        self._manager: SyncManager | None = None
+        self._pool = None
+        self._pool_size = 0
+        self._pool_epoch: int | None = None
+
+    @property
+    def driver(self) -> TypeDBDriver:
+        return self.driver_for(self.config.addresses)
+
+    @property
+    def session(self) -> TypeDBSession:
+        return self.session_for(self.config.addresses)
+
+    def driver_for(self, addresses: str | list[str]) -> TypeDBDriver:
+        label = AddressSelector.label(addresses)
+
+        if label not in self._drivers:
+            self._drivers[label] = self.config.driver_type.init(
+                addresses, self.config.username, self.config.password, self.config.simulation,
+            )
+
+        return self._drivers[label]
+
+    def session_for(self, addresses: str | list[str]) -> TypeDBSession:
+        label = AddressSelector.label(addresses)
+
+        if label not in self._sessions:
+            self._sessions[label] = self.driver_for(addresses).session(self.config.database, SessionType.DATA)
+
+        return self._sessions[label]
+
+    @property
+    def manager(self) -> SyncManager:
+        if self._manager is None:
+            self._manager = Manager()
+
+        return self._manager
+
+    def process_ids(self) -> dict[str, int]:
+        # Pool and manager processes are only reachable through private attributes, which is enough for profiling.
+        process_ids = {"parent": os.getpid()}
+
+        if self._manager is not None:
+            process_ids["manager"] = self._manager._process.pid
+
+        if self._pool is not None:
+            for worker, process in enumerate(self._pool._pool):
+                process_ids[f"worker_{worker}"] = process.pid
+
+        return process_ids
+
+    def connection(self, addresses: str | list[str] = None) -> dict:
+        if addresses is None:
+            addresses = self.config.addresses
+
+        return {
+            "driver_type": self.config.driver_type,
+            "addresses": addresses,
+            "username": self.config.username,
+            "password": self.config.password,
+            "simulation": self.config.simulation,
+            "database": self.config.database,
+            "epoch": self.epoch,
+        }
+
+    def _run_on_each_worker(self, function, *args) -> None:
+        # A worker that is dead or stuck in a load leaves the barrier short, so waits time out, and on any failure the
+        # pool is terminated rather than left holding tasks that can never complete.
+        barrier = self.manager.Barrier(self._pool_size, timeout=_barrier_timeout)
+        results = [self._pool.apply_async(function, (barrier, *args)) for _ in range(self._pool_size)]
+
+        try:
+            for result in results:
+                result.get(2 * _barrier_timeout)
+        except (BrokenBarrierError, TimeoutError) as error:
+            self.terminate_pool()
+            raise RuntimeError(f"Pool workers did not all reach the barrier within {_barrier_timeout} s.") from error
+        except BaseException:
+            self.terminate_pool()
+            raise
+
+    def terminate_pool(self) -> None:
+        # Terminated workers take their drivers and sessions with them, and the pool is rebuilt on its next use.
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_epoch = None
+
+    def _close_pool(self) -> None:
+        if self._pool is not None:
+            try:
+                self._run_on_each_worker(_release_worker, True)
+            except RuntimeError:
+                return
+
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_epoch = None
+
+    def _worker_addresses(self) -> list[str | list[str]]:
+        if self.config.address_policy is AddressPolicy.NONE:
+            return [self.config.addresses]
+        else:
+            return [[address] for address in self.config.addresses]
+
+    def pool(self, size: int):
+        if self._pool is not None and self._pool_size != size:
+            self._close_pool()
+
+        if self._pool is None:
+            self._pool = Pool(size)
+            self._pool_size = size
+
+        if self._pool_epoch != self.epoch:
+            self._run_on_each_worker(_warm_worker, [self.connection(addresses) for addresses in self._worker_addresses()])
+            self._pool_epoch = self.epoch
+
+        return self._pool
+
+    def reset(self) -> None:
+        # Sessions are closed everywhere before the database is deleted, and the new epoch makes workers reopen them.
+        while self._sessions:
+            _close_quietly(self._sessions.popitem()[1])
+
+        if self._pool is not None:
+            try:
+                self._run_on_each_worker(_release_worker, False)
+                self._pool_epoch = None
+            except RuntimeError:
+                # The pool has been terminated instead, which closes its sessions along with its workers.
+                pass
+
+        self.epoch += 1
+
+    def close(self) -> None:
+        self.reset()
+        self._close_pool()
+
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+        while self._drivers:
+            self._drivers.popitem()[1].close()
+
+    def observe(self, address_metrics: dict[str, LoadMetrics]) -> None:
+        for address, metrics in address_metrics.items():
+            if metrics.histograms["commit"].count > 0 and address in self.config.addresses:
+                self.addresses.observe(address, metrics.histograms["commit"].percentile(50))
@@ -0,0 +1,277 @@
+import fcntl
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from typedb.api.connection.session import SessionType
+from typedb.api.connection.transaction import TransactionType
+from typedb.common.exception import TypeDBDriverException
+
+
+class SimulationModel:
+    # Latencies are log-normal, given by their median and the standard deviation of their logarithm, which fits the
+    # long right tail of real commit times better than a normal distribution.
+    def __init__(
+        self,
+        open_latency: float,
+        insert_latency: float,
+        commit_latency: float,
+        commit_latency_per_query: float,
+        latency_spread: float,
+        concurrency: int,
+        conflict_rate: float,
+        exception_rate: float,
+        random_seed: int,
+    ):
+        self.open_latency = open_latency
+        self.insert_latency = insert_latency
+        self.commit_latency = commit_latency
+        self.commit_latency_per_query = commit_latency_per_query
+        self.latency_spread = latency_spread
+        self.concurrency = concurrency
+        self.conflict_rate = conflict_rate
+        self.exception_rate = exception_rate
+        self.random_seed = random_seed
+
+    def sample(self, random_source: random.Random, median: float) -> float:
+        if median <= 0:
+            return 0.0
+        elif self.latency_spread <= 0:
+            return median
+        else:
+            return random_source.lognormvariate(math.log(median), self.latency_spread)
+
+
+class _SlotDescriptors(list):
+    # Held in thread-local storage, so the descriptors of finished threads are closed along with it.
+    def __del__(self):
+        for descriptor in self:
+            os.close(descriptor)
+
+
+class _ServerSlots:
+    # The concurrency limit models one server shared by every process, so slots are advisory file locks that any pool
+    # worker can take, rather than a semaphore that could only be inherited from the parent. Each thread keeps its own
+    # descriptors, as locks held through one descriptor exclude all others, even in the same process.
+    def __init__(self, name: str, count: int):
+        directory = f"{tempfile.gettempdir()}/typedb-simulated-{name}"
+        os.makedirs(directory, exist_ok=True)
+        self._paths = [f"{directory}/slot_{slot}" for slot in range(count)]
+        self._local = threading.local()
+
+    def _descriptors(self) -> list[int]:
+        if not hasattr(self._local, "descriptors"):
+            self._local.descriptors = _SlotDescriptors(os.open(path, os.O_RDWR | os.O_CREAT) for path in self._paths)
+
+        return self._local.descriptors
+
+    def acquire(self) -> int:
+        descriptors = self._descriptors()
+
+        for descriptor in descriptors:
+            try:
+                fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return descriptor
+            except BlockingIOError:
+                continue
+
+        descriptor = random.choice(descriptors)
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+        return descriptor
+
+    @staticmethod
+    def release(descriptor: int) -> None:
+        fcntl.flock(descriptor, fcntl.LOCK_UN)
+
+
+class _SimulatedServer:
+    def __init__(self, name: str, model: SimulationModel):
+        self.model = model
+        self._slots = _ServerSlots(name, model.concurrency) if model.concurrency > 0 else None
+
+    def work(self, duration: float) -> None:
+        if self._slots is None:
+            time.sleep(duration)
+            return
+
+        slot = self._slots.acquire()
+
+        try:
+            time.sleep(duration)
+        finally:
+            self._slots.release(slot)
+
+
+class _SimulatedConcept:
+    def __init__(self, iid: str):
+        self._iid = iid
+
+    def get_iid(self) -> str:
+        return self._iid
+
+
+class _SimulatedConceptMap:
+    # Nothing is stored, so every variable of an inserted answer is given a fresh random IID.
+    def __init__(self, random_source: random.Random):
+        self._random = random_source
+
+    def get(self, variable: str) -> _SimulatedConcept:
+        return _SimulatedConcept(f"0x{self._random.getrandbits(96):024x}")
+
+
+class SimulatedQueryManager:
+    def __init__(self, transaction: "SimulatedTransaction"):
+        self._transaction = transaction
+
+    def _run(self, median: float) -> Iterator:
+        self._transaction.fail_randomly()
+        self._transaction.server.work(self._transaction.model.sample(self._transaction.random, median))
+        return iter(())
+
+    def define(self, query: str) -> None:
+        self._run(self._transaction.model.insert_latency)
+
+    def insert(self, query: str) -> Iterator:
+        # Every match is taken to succeed, so each insert answers once, as a matched or unconditional insert would.
+        self._transaction.query_count += 1
+        self._run(self._transaction.model.insert_latency)
+        return iter((_SimulatedConceptMap(self._transaction.random),))
+
+    def delete(self, query: str) -> None:
+        self._run(self._transaction.model.insert_latency)
+
+    def get(self, query: str) -> Iterator:
+        # Nothing is stored, so reads return no answers.
+        return self._run(self._transaction.model.insert_latency)
+
+
+class SimulatedTransaction:
+    def __init__(self, session: "SimulatedSession", transaction_type: TransactionType):
+        self.server = session.server
+        self.model = session.server.model
+        self.random = session.random
+        self.transaction_type = transaction_type
+        # Only data writes fail, as the harness's own schema and read transactions would otherwise fail whole tests.
+        self.faulty = session.session_type is SessionType.DATA and transaction_type is TransactionType.WRITE
+        self.query_count = 0
+        self._open = True
+        self.query = SimulatedQueryManager(self)
+        self.server.work(self.model.sample(self.random, self.model.open_latency))
+
+    def __enter__(self) -> "SimulatedTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def fail_randomly(self) -> None:
+        if not self._open:
+            raise TypeDBDriverException("Simulated transaction is closed.")
+        elif self.faulty and self.random.random() < self.model.exception_rate:
+            self._open = False
+            raise TypeDBDriverException("Simulated server exception.")
+
+    def commit(self) -> None:
+        self.fail_randomly()
+        latency = self.model.commit_latency + self.model.commit_latency_per_query * self.query_count
+        self.server.work(self.model.sample(self.random, latency))
+        self._open = False
+
+        if self.faulty and self.random.random() < self.model.conflict_rate:
+            raise TypeDBDriverException("Simulated transaction conflict.")
+
+    def rollback(self) -> None:
+        self.query_count = 0
+
+    def close(self) -> None:
+        self._open = False
+
+
+class SimulatedSession:
+    def __init__(self, server: _SimulatedServer, database: str, session_type: SessionType, random_seed: str):
+        self.server = server
+        self.database = database
+        self.session_type = session_type
+        self.random = random.Random(random_seed)
+        self._open = True
+
+    def __enter__(self) -> "SimulatedSession":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def transaction(self, transaction_type: TransactionType) -> SimulatedTransaction:
+        if not self._open:
+            raise TypeDBDriverException("Simulated session is closed.")
+
+        return SimulatedTransaction(self, transaction_type)
+
+    def close(self) -> None:
+        self._open = False
+
+
+class SimulatedDatabase:
+    def __init__(self, manager: "SimulatedDatabaseManager", name: str):
+        self._manager = manager
+        self.name = name
+
+    def delete(self) -> None:
+        self._manager.names.discard(self.name)
+
+
+class SimulatedDatabaseManager:
+    # Databases only exist in the process that created them, which is enough for the parent to manage them, and
+    # sessions in pool workers do not check for them.
+    def __init__(self):
+        self.names: set[str] = set()
+
+    def contains(self, name: str) -> bool:
+        return name in self.names
+
+    def create(self, name: str) -> None:
+        self.names.add(name)
+
+    def get(self, name: str) -> SimulatedDatabase:
+        if name not in self.names:
+            raise TypeDBDriverException(f"Simulated database does not exist: {name}")
+
+        return SimulatedDatabase(self, name)
+
+    def all(self) -> list[SimulatedDatabase]:
+        return [SimulatedDatabase(self, name) for name in self.names]
+
+
+class SimulatedDriver:
+    # Stands in for the parts of the driver API that the loaders use, so that client-side overhead can be measured
+    # without a server. Each session draws from its own random source, seeded by the process name as well as the session
+    # count, so pool workers draw independent streams that are still reproducible from run to run.
+    def __init__(self, addresses: str | list[str], model: SimulationModel):
+        label = addresses if type(addresses) is str else "|".join(addresses)
+        self.model = model
+        self.databases = SimulatedDatabaseManager()
+        self._server = _SimulatedServer(label.replace(":", "_").replace("|", "-"), model)
+        self._session_count = 0
+        self._open = True
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def session(self, database: str, session_type: SessionType) -> SimulatedSession:
+        self._session_count += 1
+        process_name = multiprocessing.current_process().name
+        random_seed = f"{self.model.random_seed}:{process_name}:{self._session_count}"
+        return SimulatedSession(self._server, database, session_type, random_seed)
+
+    def close(self) -> None:
+        self._open = False
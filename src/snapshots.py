@@ -0,0 +1,110 @@
+import os
+import subprocess
+from abc import ABC, abstractmethod
+from typedb.api.connection.session import SessionType
+from typedb.api.connection.transaction import TransactionType
+from src.resources import LoaderResources
+from src.utils import Config, Logger, SnapshotMode
+
+
+class Snapshot(ABC):
+    # A snapshot holds the database state after the fixture files, i.e. every data file but the last, so that tests
+    # only have to load and time the final file.
+    preserves_iids: bool
+
+    def __init__(self, config: Config, logger: Logger):
+        self.config = config
+        self.logger = logger
+
+    @property
+    def files(self) -> list[str]:
+        return self.config.data_files[:-1]
+
+    @abstractmethod
+    def capture(self, resources: LoaderResources) -> None:
+        ...
+
+    @abstractmethod
+    def restore(self, resources: LoaderResources) -> None:
+        ...
+
+
+class ExportSnapshot(Snapshot):
+    # Uses the server's own export and import commands, so restored databases are identical whatever loaded them, but
+    # imported concepts are given new IIDs.
+    preserves_iids = False
+
+    @property
+    def _paths(self) -> tuple[str, str]:
+        snapshot_path = f"{os.getcwd()}/{self.config.logs_dir}/{self.config.database}_snapshot"
+        return f"{snapshot_path}.typeql", f"{snapshot_path}.typedb"
+
+    def _server_command(self, action: str) -> None:
+        schema_path, data_path = self._paths
+        port = self.config.addresses[0].rsplit(":", 1)[1]
+
+        command = [
+            self.config.snapshot_command, "server", action,
+            f"--database={self.config.database}",
+            f"--port={port}",
+            f"--schema={schema_path}",
+            f"--data={data_path}",
+        ]
+
+        self.logger.info(f"  Running: {' '.join(command)}")
+        subprocess.run(command, check=True, capture_output=True)
+
+    def capture(self, resources: LoaderResources) -> None:
+        resources.reset()
+        self._server_command("export")
+
+    def restore(self, resources: LoaderResources) -> None:
+        driver = resources.driver
+
+        if driver.databases.contains(self.config.database):
+            driver.databases.get(self.config.database).delete()
+
+        self._server_command("import")
+
+
+class DeletionSnapshot(Snapshot):
+    # Keeps the fixture database and deletes everything of the types the final file inserts, which needs no server
+    # access but leaves deleted data for the storage engine to compact during later tests.
+    preserves_iids = True
+    _batch_size = 10000
+
+    def capture(self, resources: LoaderResources) -> None:
+        pass
+
+    def restore(self, resources: LoaderResources) -> None:
+        with resources.driver.session(self.config.database, SessionType.DATA) as session:
+            for type_label in self.config.snapshot_delete_types:
+                deleted = 0
+
+                while True:
+                    with session.transaction(TransactionType.READ) as transaction:
+                        answers = transaction.query.get(f"match $x isa {type_label}; get $x; limit {self._batch_size};")
+                        iids = [answer.get("x").get_iid() for answer in answers]
+
+                    if not iids:
+                        break
+
+                    with session.transaction(TransactionType.WRITE) as transaction:
+                        for iid in iids:
+                            transaction.query.delete(f"match $x iid {iid}; delete $x isa {type_label};")
+
+                        transaction.commit()
+
+                    deleted += len(iids)
+
+                self.logger.info(f"  Deleted {deleted} instances of: {type_label}")
+
+
+def init_snapshot(config: Config, logger: Logger) -> Snapshot | None:
+    match config.snapshot_mode:
+        case SnapshotMode.NONE:
+            return None
+        case SnapshotMode.EXPORT:
+            return ExportSnapshot(config, logger)
+        case SnapshotMode.DELETE:
+            return DeletionSnapshot(config, logger)
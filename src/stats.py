@@ -0,0 +1,50 @@
+import math
+import statistics
+from statistics import NormalDist
+
+
+# Exact quantiles for the fewest degrees of freedom, where the expansion below is far too small, e.g. 9.7 rather than
+# 12.7 for a 95% interval from two samples.
+_t_quantiles = {
+    0.975: (12.706, 4.303, 3.182, 2.776, 2.571),
+    0.995: (63.657, 9.925, 5.841, 4.604, 4.032),
+}
+
+
+def t_quantile(probability: float, degrees_of_freedom: int) -> float:
+    # Cornish-Fisher expansion of Student's t about the normal quantile, accurate to within 1% from six degrees of
+    # freedom, which avoids a SciPy dependency for the handful of quantiles needed here.
+    if probability in _t_quantiles and degrees_of_freedom <= len(_t_quantiles[probability]):
+        return _t_quantiles[probability][degrees_of_freedom - 1]
+
+    z = NormalDist().inv_cdf(probability)
+    v = degrees_of_freedom
+    return (
+        z
+        + (z ** 3 + z) / (4 * v)
+        + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+        + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3)
+    )
+
+
+def confidence_interval(samples: list[float], confidence: float = 0.95) -> tuple[float, float]:
+    # Returns the sample mean and the half-width of its confidence interval, which is infinite below two samples.
+    if not samples:
+        return 0.0, math.inf
+    elif len(samples) == 1:
+        return samples[0], math.inf
+
+    mean = statistics.fmean(samples)
+    standard_error = statistics.stdev(samples) / math.sqrt(len(samples))
+    return mean, t_quantile((1 + confidence) / 2, len(samples) - 1) * standard_error
+
+
+def describe(samples: list[float], confidence: float = 0.95) -> tuple[float, float, float]:
+    # Returns the mean, sample standard deviation and confidence half-width, with both spreads undefined below two
+    # samples, so that single trials are never reported as exact.
+    mean, half_width = confidence_interval(samples, confidence)
+
+    if len(samples) < 2:
+        return mean, math.nan, math.nan
+
+    return mean, statistics.stdev(samples), half_width
@@ -0,0 +1,100 @@
+import math
+import threading
+import time
+from collections.abc import Callable
+from src.checkpoint import Checkpoint
+from src.stats import confidence_interval
+from src.utils import Config, MeasurementMode
+
+
+class SteadyStateMonitor:
+    # Samples the committed-query rate from the checkpoint journal, which every loader appends to from every process,
+    # so the rate is measured the same way whether commits happen in this process or in pool workers.
+    _confidence = 0.95
+
+    def __init__(
+        self,
+        checkpoint: Checkpoint,
+        data_path: str,
+        config: Config,
+        stop: Callable[[], None],
+    ):
+        self.checkpoint = checkpoint
+        self.data_path = data_path
+        self.config = config
+        self.samples: list[float] = list()
+        self.stop_reason: str | None = None
+        self._stop = stop
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @classmethod
+    def columns(cls, prefix: str) -> list[str]:
+        return [f"{prefix}_steady_rate", f"{prefix}_steady_rate_ci", f"{prefix}_steady_samples"]
+
+    @property
+    def rate(self) -> tuple[float, float]:
+        return confidence_interval(self.samples, self._confidence)
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason is not None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join()
+
+    def _should_stop(self, elapsed: float) -> str | None:
+        # Query budgets are enforced by the loader as it feeds queries, so only the stops that depend on the measured
+        # rate or the elapsed time are decided here.
+        if self.config.measurement_mode is not MeasurementMode.STEADY_STATE:
+            return None
+
+        mean, half_width = self.rate
+
+        if len(self.samples) >= self.config.minimum_samples and mean > 0 and half_width / mean <= self.config.confidence_width:
+            return "confidence"
+        elif 0 < self.config.time_budget <= elapsed:
+            return "time budget"
+        else:
+            return None
+
+    def _run(self) -> None:
+        # The journal is tailed from its current end, so earlier files and resumed progress are never counted as rate.
+        _, offset = self.checkpoint.committed(self.data_path)
+        start = time.time()
+        committed = 0
+        sample_start: float | None = None
+        sample_committed = 0
+
+        while not self._closed.wait(self.config.sample_interval):
+            count, offset = self.checkpoint.committed(self.data_path, offset)
+            committed += count
+            now = time.time()
+
+            if now - start >= self.config.warmup_time:
+                if sample_start is not None:
+                    self.samples.append((committed - sample_committed) / (now - sample_start))
+
+                sample_start, sample_committed = now, committed
+
+            self.stop_reason = self._should_stop(now - start)
+
+            if self.stopped:
+                self._stop()
+                return
+
+    def summary(self, prefix: str) -> dict[str, float]:
+        mean, half_width = self.rate
+
+        if math.isinf(half_width):
+            half_width = math.nan
+
+        return {
+            f"{prefix}_steady_rate": mean,
+            f"{prefix}_steady_rate_ci": half_width,
+            f"{prefix}_steady_samples": len(self.samples),
+        }
@@ -1,5 +1,8 @@
 import datetime
 import os
+import random
+import shlex
+import time
 from configparser import ConfigParser
 from enum import Enum
 from getpass import getpass
@@ -7,16 +10,94 @@ from random import Random
 from typedb.api.connection.credential import TypeDBCredential
 from typedb.api.connection.driver import TypeDBDriver
 from typedb.driver import TypeDB
+from src.simulation import SimulatedDriver, SimulationModel
 
 
 class LoaderType(Enum):
     CAROUSEL = "carousel"
     POOL = "pool"
+    SHARDED_POOL = "sharded_pool"
+    ADAPTIVE = "adaptive"
+    PIPELINED_CAROUSEL = "pipelined_carousel"
+    ASYNC = "async"
+    HYBRID_POOL = "hybrid_pool"
+    JAVA_POOL = "java_pool"
+    NODE_ASYNC = "node_async"
+
+    @property
+    def external(self) -> bool:
+        return self in (LoaderType.JAVA_POOL, LoaderType.NODE_ASYNC)
+
+
+class DatasetFormat(Enum):
+    TQL = "tql"
+    COLUMNAR = "columnar"
+
+    @property
+    def suffix(self) -> str:
+        match self:
+            case DatasetFormat.TQL:
+                return ".tql"
+            case DatasetFormat.COLUMNAR:
+                return ".tqlc"
+
+
+class Compression(Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    BZ2 = "bz2"
+    LZMA = "lzma"
+
+    @property
+    def suffix(self) -> str:
+        match self:
+            case Compression.NONE:
+                return ""
+            case Compression.GZIP:
+                return ".gz"
+            case Compression.BZ2:
+                return ".bz2"
+            case Compression.LZMA:
+                return ".xz"
+
+
+class GenerationMode(Enum):
+    SERIAL = "serial"
+    PARALLEL = "parallel"
+
+
+class PartitioningMode(Enum):
+    ROUND_ROBIN = "round_robin"
+    HASHED = "hashed"
+
+
+class AddressPolicy(Enum):
+    NONE = "none"
+    ROUND_ROBIN = "round_robin"
+    WEIGHTED = "weighted"
+    LEAST_LATENCY = "least_latency"
+
+
+class MeasurementMode(Enum):
+    FULL = "full"
+    STEADY_STATE = "steady_state"
+
+
+class SweepStrategy(Enum):
+    GRID = "grid"
+    SUCCESSIVE_HALVING = "successive_halving"
+
+
+class SnapshotMode(Enum):
+    NONE = "none"
+    EXPORT = "export"
+    DELETE = "delete"
 
 
 class DriverType(Enum):
     CORE = "core"
     CLOUD = "cloud"
+    SIMULATED = "simulated"
 
     @property
     def _constructor(self):
@@ -25,8 +106,16 @@ class DriverType(Enum):
                 return TypeDB.core_driver
             case DriverType.CLOUD:
                 return TypeDB.cloud_driver
-
-    def init(self, addresses: str | list[str], username: str = None, password: str = None) -> TypeDBDriver:
+            case DriverType.SIMULATED:
+                return SimulatedDriver
+
+    def init(
+        self,
+        addresses: str | list[str],
+        username: str = None,
+        password: str = None,
+        simulation: SimulationModel = None,
+    ) -> TypeDBDriver:
         match self:
             case DriverType.CORE:
                 if type(addresses) is str:
@@ -41,6 +130,11 @@ class DriverType(Enum):
                     "addresses": addresses,
                     "credential": TypeDBCredential(username, password, tls_enabled=True),
                 }
+            case DriverType.SIMULATED:
+                if simulation is None:
+                    raise ValueError("Simulation model not set for simulated driver.")
+
+                kwargs = {"addresses": addresses, "model": simulation}
 
         return self._constructor(**kwargs)
 
@@ -114,6 +208,20 @@ class RandomGenerator:
         return "".join(self.char(char_set) for _ in range(length))
 
 
+class RetryPolicy:
+    def __init__(self, maximum_attempts: int, base_wait: float, maximum_wait: float):
+        self.maximum_attempts = maximum_attempts
+        self.base_wait = base_wait
+        self.maximum_wait = maximum_wait
+
+    def wait(self, attempt: int) -> float:
+        # Exponential backoff with full jitter, so that workers failing together do not retry together.
+        return random.uniform(0, min(self.maximum_wait, self.base_wait * 2 ** (attempt - 1)))
+
+    def backoff(self, attempt: int) -> None:
+        time.sleep(self.wait(attempt))
+
+
 class Config:
     def __init__(self, path: str = "config.ini"):
         config_path = f"{os.getcwd()}/{path}"
@@ -122,30 +230,102 @@ class Config:
         self.dataset_dir = self._str(parser["project"]["dataset_dir"])
         self.results_dir = self._str(parser["project"]["results_dir"])
         self.logs_dir = self._str(parser["project"]["logs_dir"])
+        self.dataset_format = self._dataset_format(parser["project"]["dataset_format"])
+        self.compression = self._compression(parser["project"]["compression"])
         self.driver_type = self._driver_type(parser["connection"]["driver_type"])
         self.addresses = self._str_list(parser["connection"]["addresses"])
+        self.address_policy = self._address_policy(parser["connection"]["address_policy"])
+        self.address_weights = self._float_list(parser["connection"]["address_weights"])
         self.username = self._str(parser["connection"]["username"])
         self.database = self._str(parser["connection"]["database"])
         self.entity_count = self._int(parser["generation"]["entity_count"])
         self.relation_count = self._int(parser["generation"]["relation_count"])
         self.attributes_per_entity = self._int(parser["generation"]["attributes_per_entity"])
         self.random_seed = self._int(parser["generation"]["random_seed"])
+        self.generation_mode = self._generation_mode(parser["generation"]["generation_mode"])
+        self.generation_workers = self._int(parser["generation"]["generation_workers"])
+        self.generation_chunk_size = self._int(parser["generation"]["generation_chunk_size"])
         self.schema_file = self._str(parser["loading"]["schema_file"])
         self.data_files = self._str_list(parser["loading"]["data_files"])
         self.loader_types = self._list_loader_type(parser["loading"]["loader_types"])
         self.batch_sizes = self._int_list(parser["loading"]["batch_sizes"])
         self.transaction_counts = self._int_list(parser["loading"]["transaction_counts"])
+        self.coalescing_factors = self._int_list(parser["loading"]["coalescing_factors"])
+        self.coalescing_key_attributes = self._str_list(parser["loading"]["coalescing_key_attributes"])
+        self.partitioning_mode = self._partitioning_mode(parser["loading"]["partitioning_mode"])
+        self.partitioning_key_attribute = self._str(parser["loading"]["partitioning_key_attribute"])
         self.test_reattempt_wait = self._int(parser["loading"]["test_reattempt_wait"])
         self.maximum_test_attempts = self._int(parser["loading"]["maximum_test_attempts"])
-        self.result_files = self._str_list(parser["plotting"]["result_files"])
+        self.maximum_batch_attempts = self._int(parser["loading"]["maximum_batch_attempts"])
+        self.batch_reattempt_wait = self._float(parser["loading"]["batch_reattempt_wait"])
+        self.maximum_batch_reattempt_wait = self._float(parser["loading"]["maximum_batch_reattempt_wait"])
+        self.dead_letter_file = self._str(parser["loading"]["dead_letter_file"])
+        self.checkpoint_file = self._str(parser["loading"]["checkpoint_file"])
+        self.resume = self._bool(parser["loading"]["resume"])
+        self.adaptive_maximum_batch_size = self._int(parser["loading"]["adaptive_maximum_batch_size"])
+        self.adaptive_maximum_transaction_count = self._int(parser["loading"]["adaptive_maximum_transaction_count"])
+        self.pipeline_depth = self._int(parser["loading"]["pipeline_depth"])
+        self.hybrid_process_count = self._int(parser["loading"]["hybrid_process_count"])
+        self.read_ahead_depth = self._int(parser["loading"]["read_ahead_depth"])
+        self.measurement_mode = self._measurement_mode(parser["loading"]["measurement_mode"])
+        self.warmup_time = self._float(parser["loading"]["warmup_time"])
+        self.sample_interval = self._float(parser["loading"]["sample_interval"])
+        self.confidence_width = self._float(parser["loading"]["confidence_width"])
+        self.minimum_samples = self._int(parser["loading"]["minimum_samples"])
+        self.time_budget = self._float(parser["loading"]["time_budget"])
+        self.query_budget = self._int(parser["loading"]["query_budget"])
+        self.sweep_strategy = self._sweep_strategy(parser["loading"]["sweep_strategy"])
+        self.sweep_time_budget = self._float(parser["loading"]["sweep_time_budget"])
+        self.halving_factor = self._int(parser["loading"]["halving_factor"])
+        self.halving_minimum_queries = self._int(parser["loading"]["halving_minimum_queries"])
+        self.profile = self._bool(parser["loading"]["profile"])
+        self.profile_interval = self._float(parser["loading"]["profile_interval"])
+        self.profile_file = self._str(parser["loading"]["profile_file"])
+        self.snapshot_mode = self._snapshot_mode(parser["loading"]["snapshot_mode"])
+        self.snapshot_command = self._str(parser["loading"]["snapshot_command"])
+        self.snapshot_delete_types = self._str_list(parser["loading"]["snapshot_delete_types"])
+        self.iid_cache = self._bool(parser["loading"]["iid_cache"])
+        self.iid_cache_file = self._str(parser["loading"]["iid_cache_file"])
+        self.iid_cache_attribute = self._str(parser["loading"]["iid_cache_attribute"])
+        self.trial_count = self._int(parser["loading"]["trial_count"])
+        self.trial_seed = self._int(parser["loading"]["trial_seed"])
+        self.java_command = self._command(parser["loading"]["java_command"])
+        self.node_command = self._command(parser["loading"]["node_command"])
+        self.simulation = SimulationModel(
+            self._float(parser["simulation"]["open_latency"]),
+            self._float(parser["simulation"]["insert_latency"]),
+            self._float(parser["simulation"]["commit_latency"]),
+            self._float(parser["simulation"]["commit_latency_per_query"]),
+            self._float(parser["simulation"]["latency_spread"]),
+            self._int(parser["simulation"]["concurrency"]),
+            self._float(parser["simulation"]["conflict_rate"]),
+            self._float(parser["simulation"]["exception_rate"]),
+            self._int(parser["simulation"]["random_seed"]),
+        )
+        self.result_files = [file for file in self._str_list(parser["plotting"]["result_files"]) if file]
         self.series_variable = self._str(parser["plotting"]["series_variable"])
         self.axis_variable = self._str(parser["plotting"]["axis_variable"])
 
+        if self.dataset_format is DatasetFormat.COLUMNAR and self.compression is not Compression.NONE:
+            raise ValueError("Compression is only supported for the tql dataset format.")
+
+        # Shards seek into the decompressed stream, so every shard of a compressed file decompresses it from the start.
+        if LoaderType.SHARDED_POOL in self.loader_types and self.compression is not Compression.NONE:
+            raise ValueError("The sharded_pool loader type does not support compressed inputs.")
+
         if self.driver_type is DriverType.CLOUD:
             self.password = getpass()
         else:
             self.password = None
 
+    @property
+    def data_suffix(self) -> str:
+        return f"{self.dataset_format.suffix}{self.compression.suffix}"
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(self.maximum_batch_attempts, self.batch_reattempt_wait, self.maximum_batch_reattempt_wait)
+
     @staticmethod
     def _str(value: str) -> str:
         return value.strip()
@@ -154,6 +334,10 @@ class Config:
     def _int(value: str) -> int:
         return int(Config._str(value))
 
+    @staticmethod
+    def _float(value: str) -> float:
+        return float(Config._str(value))
+
     @staticmethod
     def _bool(value: str) -> bool:
         if Config._str(value) not in ("true", "false"):
@@ -169,10 +353,50 @@ class Config:
     def _int_list(value: str) -> list[int]:
         return [Config._int(item) for item in Config._str_list(value)]
 
+    @staticmethod
+    def _float_list(value: str) -> list[float]:
+        return [Config._float(item) for item in Config._str_list(value)]
+
+    @staticmethod
+    def _command(value: str) -> list[str]:
+        return shlex.split(Config._str(value))
+
     @staticmethod
     def _driver_type(value: str) -> DriverType:
         return DriverType(Config._str(value))
 
+    @staticmethod
+    def _address_policy(value: str) -> AddressPolicy:
+        return AddressPolicy(Config._str(value))
+
+    @staticmethod
+    def _dataset_format(value: str) -> DatasetFormat:
+        return DatasetFormat(Config._str(value))
+
+    @staticmethod
+    def _compression(value: str) -> Compression:
+        return Compression(Config._str(value))
+
+    @staticmethod
+    def _measurement_mode(value: str) -> MeasurementMode:
+        return MeasurementMode(Config._str(value))
+
+    @staticmethod
+    def _sweep_strategy(value: str) -> SweepStrategy:
+        return SweepStrategy(Config._str(value))
+
+    @staticmethod
+    def _snapshot_mode(value: str) -> SnapshotMode:
+        return SnapshotMode(Config._str(value))
+
+    @staticmethod
+    def _generation_mode(value: str) -> GenerationMode:
+        return GenerationMode(Config._str(value))
+
+    @staticmethod
+    def _partitioning_mode(value: str) -> PartitioningMode:
+        return PartitioningMode(Config._str(value))
+
     @staticmethod
     def _loader_type(value: str) -> LoaderType:
         return LoaderType(Config._str(value))